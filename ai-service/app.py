@@ -1,7 +1,11 @@
 import os
 import asyncio
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+import hashlib
+import tempfile
+import aiofiles
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import uvicorn
@@ -11,10 +15,16 @@ from services.resume_parser import ResumeParser
 from services.ai_processor import AIProcessor
 from services.chatbot import ChatbotService
 from services.job_matcher import JobMatcher
+from services.llm_cache import LLMCache
 
 load_dotenv()
 
-app = FastAPI(title="Resume Screening AI Service", version="1.0.0")
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Bump to invalidate cached /process-resume responses and client ETags
+RESPONSE_CACHE_VERSION = "v2"
+
+app = FastAPI(title="Resume Screening AI Service", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -23,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Initialize services
@@ -30,12 +41,21 @@ resume_parser = ResumeParser()
 ai_processor = AIProcessor()
 chatbot_service = ChatbotService()
 job_matcher = JobMatcher()
+response_cache = LLMCache(ttl=24 * 3600)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await ai_processor.aclose()
+    await resume_parser.aclose()
 
 # Pydantic models
 class ResumeProcessRequest(BaseModel):
     file_url: str
     file_name: str
 
+class BatchResumeProcessRequest(BaseModel):
+    resumes: List[ResumeProcessRequest]
+
 class ChatMessage(BaseModel):
     message: str
     conversation_history: List[Dict[str, str]] = []
@@ -46,6 +66,10 @@ class JobMatchRequest(BaseModel):
     resume_data: Dict[str, Any]
     job_data: Dict[str, Any]
 
+class BatchJobMatchRequest(BaseModel):
+    resumes: List[Dict[str, Any]]
+    jobs: List[Dict[str, Any]]
+
 class ResumeAnalysisResponse(BaseModel):
     parsed_data: Dict[str, Any]
     ai_score: int
@@ -58,6 +82,7 @@ class ChatResponse(BaseModel):
     confidence: float
     entities: List[Dict[str, Any]]
     updated_context: Dict[str, Any]
+    cache_hit: bool = False
 
 @app.get("/")
 async def root():
@@ -76,30 +101,96 @@ async def health_check():
     }
 
 @app.post("/process-resume", response_model=ResumeAnalysisResponse)
-async def process_resume(request: ResumeProcessRequest):
+async def process_resume(request: ResumeProcessRequest, http_request: Request):
     """Process resume using GROQ + GEMINI AI services"""
     try:
         import time
         start_time = time.time()
         
-        # Parse resume content
-        parsed_data = await resume_parser.parse_resume(request.file_url, request.file_name)
+        # The same file yields the same analysis, so let clients and the cache reuse it
+        etag = hashlib.sha256(
+            f"{request.file_url}|{request.file_name}|{RESPONSE_CACHE_VERSION}".encode()
+        ).hexdigest()
+        etag_header = f'"{etag}"'
+        if http_request.headers.get("if-none-match") == etag_header:
+            return Response(status_code=304, headers={"ETag": etag_header})
         
-        # Process with AI for scoring and analysis
-        ai_result = await ai_processor.analyze_resume(parsed_data)
+        # Only the analysis is cached; processing_time always reflects this request
+        cached = await response_cache.get(etag)
+        if cached is not None:
+            parsed_data, ai_score, analysis = cached["parsed_data"], cached["ai_score"], cached["analysis"]
+        else:
+            # Parse resume content
+            parsed_data = await resume_parser.parse_resume(request.file_url, request.file_name)
+            
+            # Process with AI for scoring and analysis
+            ai_result = await ai_processor.analyze_resume(parsed_data)
+            ai_score = int(round(ai_result["score"]))
+            analysis = ai_result["analysis"]
+            
+            # A provider outage yields a fallback analysis; don't pin it for the cache TTL
+            if not ai_result.get("degraded"):
+                await response_cache.set(etag, {
+                    "parsed_data": parsed_data,
+                    "ai_score": ai_score,
+                    "analysis": analysis
+                })
         
         processing_time = time.time() - start_time
         
-        return ResumeAnalysisResponse(
+        # Server-built data: skip re-validation and serialize straight to JSON.
+        # Scores can be floats, so they were coerced to the declared int above.
+        result = ResumeAnalysisResponse.model_construct(
             parsed_data=parsed_data,
-            ai_score=ai_result["score"],
-            analysis=ai_result["analysis"],
+            ai_score=ai_score,
+            analysis=analysis,
             processing_time=processing_time
         )
+        body = result.model_dump_json()
+        
+        return Response(content=body, media_type="application/json", headers={"ETag": etag_header})
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Resume processing failed: {str(e)}")
 
+@app.post("/process-resumes")
+async def process_resumes(request: BatchResumeProcessRequest):
+    """Process multiple resumes in one request, analyzing them concurrently"""
+    try:
+        import time
+        start_time = time.time()
+        
+        # Parse all resumes across worker processes; failures come back per resume
+        parsed_resumes = await resume_parser.parse_batch([
+            (resume.file_url, resume.file_name)
+            for resume in request.resumes
+        ])
+        parsed_indexes = [i for i, parsed_data in enumerate(parsed_resumes) if "error" not in parsed_data]
+        
+        # Score the parsed ones with bounded concurrency against the AI providers
+        ai_results = await ai_processor.analyze_resumes_batch([parsed_resumes[i] for i in parsed_indexes])
+        ai_results_by_index = dict(zip(parsed_indexes, ai_results))
+        
+        results = []
+        for i, parsed_data in enumerate(parsed_resumes):
+            ai_result = ai_results_by_index.get(i)
+            if ai_result is None:
+                results.append({"error": parsed_data["error"]})
+            else:
+                results.append({
+                    "parsed_data": parsed_data,
+                    "ai_score": int(round(ai_result["score"])),
+                    "analysis": ai_result["analysis"]
+                })
+        
+        return {
+            "results": results,
+            "processing_time": time.time() - start_time
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch resume processing failed: {str(e)}")
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat_with_bot(request: ChatMessage):
     """Process chat message using GROQ + GEMINI"""
@@ -111,11 +202,25 @@ async def chat_with_bot(request: ChatMessage):
             context=request.context
         )
         
-        return ChatResponse(**response)
+        result = ChatResponse.model_construct(**response)
+        return Response(content=result.model_dump_json(), media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
+@app.post("/chat/stream")
+async def stream_chat_with_bot(request: ChatMessage):
+    """Stream the chatbot reply as plain text while it is generated"""
+    return StreamingResponse(
+        chatbot_service.stream_message(
+            message=request.message,
+            conversation_history=request.conversation_history,
+            user_role=request.user_role,
+            context=request.context
+        ),
+        media_type="text/plain"
+    )
+
 @app.post("/match-job")
 async def match_job_to_resume(request: JobMatchRequest):
     """Calculate job match score using AI"""
@@ -130,6 +235,20 @@ async def match_job_to_resume(request: JobMatchRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Job matching failed: {str(e)}")
 
+@app.post("/match-jobs")
+async def match_jobs_to_resumes(request: BatchJobMatchRequest):
+    """Match every resume against every job; matches[i][j] scores resumes[i] against jobs[j]"""
+    try:
+        matches = await job_matcher.calculate_matches_batch(
+            resumes=request.resumes,
+            jobs=request.jobs
+        )
+        
+        return {"matches": matches}
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch job matching failed: {str(e)}")
+
 @app.post("/upload-resume")
 async def upload_resume_file(file: UploadFile = File(...)):
     """Upload and process resume file directly"""
@@ -137,20 +256,26 @@ async def upload_resume_file(file: UploadFile = File(...)):
         if not file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
         
-        # Save uploaded file temporarily
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Parse the file
-        parsed_data = await resume_parser.parse_file(temp_path)
+        # Save uploaded file under a unique temp name, keeping the extension for the parser
+        suffix = os.path.splitext(file.filename)[1]
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_path = temp_file.name
         
-        # Process with AI
-        ai_result = await ai_processor.analyze_resume(parsed_data)
+        try:
+            # Stream to disk in chunks so memory stays bounded for large uploads
+            async with aiofiles.open(temp_path, "wb") as buffer:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await buffer.write(chunk)
+            
+            # Parse the file
+            parsed_data = await resume_parser.parse_file(temp_path)
+            
+            # Process with AI
+            ai_result = await ai_processor.analyze_resume(parsed_data)
         
-        # Clean up temp file
-        os.remove(temp_path)
+        finally:
+            # Clean up temp file, including on failure, without blocking the event loop
+            await asyncio.to_thread(os.remove, temp_path)
         
         return {
             "parsed_data": parsed_data,
@@ -172,10 +297,10 @@ async def analyze_skills(skills: List[str]):
         raise HTTPException(status_code=500, detail=f"Skills analysis failed: {str(e)}")
 
 @app.post("/generate-interview-questions")
-async def generate_interview_questions(job_data: Dict[str, Any], candidate_data: Dict[str, Any]):
+async def generate_interview_questions(job_data: Dict[str, Any], candidate_data: Dict[str, Any], use_cache: bool = False):
     """Generate interview questions based on job and candidate profile"""
     try:
-        questions = await ai_processor.generate_interview_questions(job_data, candidate_data)
+        questions = await ai_processor.generate_interview_questions(job_data, candidate_data, use_cache=use_cache)
         return {"questions": questions}
     
     except Exception as e:
@@ -1,26 +1,131 @@
 import os
 import asyncio
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import google.generativeai as genai
-from groq import Groq
-import json
+from groq import AsyncGroq
+import httpx
 import re
+import orjson
+import ahocorasick
+
+from services.llm_cache import LLMCache
+
+# Patterns used to parse LLM responses, compiled once at import
+_STRENGTHS_RE = re.compile(r'strengths?:?\s*(.+?)(?=weaknesses?|$)', re.IGNORECASE | re.DOTALL)
+_WEAKNESSES_RE = re.compile(r'weaknesses?:?\s*(.+?)(?=recommendations?|$)', re.IGNORECASE | re.DOTALL)
+_LIST_SPLIT_RE = re.compile(r'[•\-\n]')
+_NUMBER_PREFIX_RE = re.compile(r'^\d+\.?\s*')
+
+# Static instructions go first so providers can reuse the cached prompt prefix;
+# only the resume data varies between requests
+_ANALYSIS_SYSTEM_PROMPT = """You are an expert resume analyzer. Provide detailed analysis in JSON format.
+Analyze the resume and provide a comprehensive assessment. Return your analysis in JSON format with the following structure:
+{
+    "strengths": ["list of key strengths"],
+    "weaknesses": ["list of areas for improvement"],
+    "recommendations": ["list of recommendations"],
+    "skills_match": [{"skill": "skill_name", "confidence": 0.0-1.0}],
+    "experience_level": "entry|mid|senior|executive",
+    "technical_depth": "basic|intermediate|advanced|expert",
+    "leadership_potential": "low|medium|high",
+    "adaptability_score": 0-100
+}"""
+
+# Score adjustments applied on top of the base score from AI analysis labels
+_EXPERIENCE_ADJUSTMENTS = {'senior': 5, 'executive': 10, 'entry': -5}
+_DEPTH_ADJUSTMENTS = {'expert': 8, 'advanced': 5, 'basic': -3}
+_LEADERSHIP_ADJUSTMENTS = {'high': 5, 'low': -2}
+
+def _score_kernel(n_skills: int, total_experience: float, n_education: int,
+                  has_advanced_degree: bool, n_certifications: int) -> int:
+    """Base score from scalar resume features"""
+    # Skills (30 points max) and experience (40 points max)
+    score = min(30, n_skills * 2) + min(40, total_experience * 8)
+    
+    # Education (20 points, 25 with an advanced degree)
+    if n_education:
+        score += 25 if has_advanced_degree else 20
+    
+    # Certifications (10 points max)
+    score += min(10, n_certifications * 3)
+    
+    return min(100, score)
+
+def _extract_json_obj(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text using a single linear scan"""
+    start = text.find('{')
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return None
 
 class AIProcessor:
+    __slots__ = (
+        "_http", "groq_client", "gemini_model", "fast_path_enabled", "fast_path_low",
+        "fast_path_high", "cache", "skill_categories", "_skill_automaton"
+    )
+
     def __init__(self):
-        # Initialize GROQ client
-        self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        # Pooled HTTP client so GROQ calls reuse keep-alive connections
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        
+        # Initialize GROQ client (async so requests don't block the event loop)
+        self.groq_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=self._http)
         
         # Initialize GEMINI
         genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
         self.gemini_model = genai.GenerativeModel('gemini-pro')
         
+        # Skip the LLM calls for resumes whose base score is already decisive
+        self.fast_path_enabled = os.getenv("AI_FAST_PATH", "0") == "1"
+        self.fast_path_low = int(os.getenv("AI_FAST_PATH_LOW", 25))
+        self.fast_path_high = int(os.getenv("AI_FAST_PATH_HIGH", 90))
+        
+        # Cache for LLM completions keyed by their inputs
+        self.cache = LLMCache(ttl=int(os.getenv("LLM_CACHE_TTL", 3600)))
+        
         # Skill categories for analysis
         self.skill_categories = {
-            'technical': ['programming', 'software', 'development', 'coding', 'database', 'cloud', 'devops'],
-            'soft': ['communication', 'leadership', 'teamwork', 'problem-solving', 'analytical', 'creative'],
-            'domain': ['finance', 'healthcare', 'education', 'marketing', 'sales', 'hr', 'legal']
+            'technical': frozenset(['programming', 'software', 'development', 'coding', 'database', 'cloud', 'devops']),
+            'soft': frozenset(['communication', 'leadership', 'teamwork', 'problem-solving', 'analytical', 'creative']),
+            'domain': frozenset(['finance', 'healthcare', 'education', 'marketing', 'sales', 'hr', 'legal'])
         }
+        
+        # Keyword automaton: one scan per skill finds every category keyword.
+        # Values carry the category rank so the first category still wins.
+        self._skill_automaton = ahocorasick.Automaton()
+        for rank, (category, keywords) in enumerate(self.skill_categories.items()):
+            for keyword in keywords:
+                if keyword not in self._skill_automaton:
+                    self._skill_automaton.add_word(keyword, (rank, category))
+        self._skill_automaton.make_automaton()
+
+    async def aclose(self):
+        """Close pooled connections on shutdown"""
+        await self._http.aclose()
 
     async def analyze_resume(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze resume using GROQ + GEMINI"""
@@ -28,21 +133,42 @@ class AIProcessor:
             # Calculate base score
             base_score = self._calculate_base_score(parsed_data)
             
-            # Get AI analysis from GROQ
-            groq_analysis = await self._get_groq_analysis(parsed_data)
-            
-            # Get additional insights from GEMINI
-            gemini_insights = await self._get_gemini_insights(parsed_data)
+            # Deterministic scoring is enough at the extremes
+            if self.fast_path_enabled and (base_score < self.fast_path_low or base_score > self.fast_path_high):
+                return {
+                    "score": base_score,
+                    "analysis": self._get_fallback_analysis(parsed_data),
+                    "degraded": False
+                }
             
+            # Get AI analysis from GROQ and additional insights from GEMINI concurrently
+            groq_analysis, gemini_insights = await asyncio.gather(
+                self._get_groq_analysis(parsed_data),
+                self._get_gemini_insights(parsed_data),
+                return_exceptions=True
+            )
+
+            # Fall back per provider so one failure doesn't discard the other;
+            # the providers have already logged their errors
+            degraded = False
+            if isinstance(groq_analysis, Exception):
+                groq_analysis = self._get_fallback_analysis(parsed_data)
+                degraded = True
+            if isinstance(gemini_insights, Exception):
+                gemini_insights = self._get_fallback_insights(parsed_data)
+                degraded = True
+
             # Combine analyses
             final_analysis = self._combine_analyses(groq_analysis, gemini_insights)
             
             # Adjust score based on AI analysis
             final_score = self._adjust_score_with_ai(base_score, final_analysis)
             
+            # Degraded results stand in for a provider outage and shouldn't be cached
             return {
                 "score": final_score,
-                "analysis": final_analysis
+                "analysis": final_analysis,
+                "degraded": degraded
             }
         
         except Exception as e:
@@ -50,45 +176,76 @@ class AIProcessor:
             # Fallback to basic analysis
             return {
                 "score": self._calculate_base_score(parsed_data),
-                "analysis": self._get_fallback_analysis(parsed_data)
+                "analysis": self._get_fallback_analysis(parsed_data),
+                "degraded": True
             }
 
+    async def analyze_resumes_batch(self, resumes: List[Dict[str, Any]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Analyze many resumes concurrently, bounded to stay within provider rate limits"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded_analyze(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_resume(parsed_data)
+        
+        # gather preserves input order
+        return await asyncio.gather(*(bounded_analyze(parsed_data) for parsed_data in resumes))
+
     async def _get_groq_analysis(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Get analysis from GROQ API"""
         try:
+            temperature = 0
+            cache_key = None
+            if self.cache.should_cache(temperature):
+                cache_key = self.cache.make_key("groq_analysis", parsed_data)
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             # Prepare prompt for GROQ
             prompt = self._create_analysis_prompt(parsed_data)
             
             # Call GROQ API
-            response = self.groq_client.chat.completions.create(
+            response = await self.groq_client.chat.completions.create(
                 messages=[
-                    {"role": "system", "content": "You are an expert resume analyzer. Provide detailed analysis in JSON format."},
+                    {"role": "system", "content": _ANALYSIS_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 model="mixtral-8x7b-32768",
-                temperature=0.3,
-                max_tokens=2000
+                temperature=temperature,
+                max_tokens=2000,
+                response_format={"type": "json_object"}
             )
             
             # Parse response
             analysis_text = response.choices[0].message.content
             
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
-            if json_match:
-                analysis = json.loads(json_match.group())
-            else:
+            # JSON mode returns a bare object; text parsing is only a last resort
+            try:
+                analysis = orjson.loads(analysis_text)
+            except orjson.JSONDecodeError:
                 analysis = self._parse_text_analysis(analysis_text)
             
+            if cache_key:
+                await self.cache.set(cache_key, analysis)
+            
             return analysis
         
         except Exception as e:
             print(f"GROQ analysis error: {str(e)}")
-            return self._get_fallback_analysis(parsed_data)
+            raise
 
     async def _get_gemini_insights(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Get insights from GEMINI API"""
         try:
+            temperature = 0
+            cache_key = None
+            if self.cache.should_cache(temperature):
+                cache_key = self.cache.make_key("gemini_insights", parsed_data)
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             # Prepare prompt for GEMINI
             prompt = f"""
             Analyze this resume data and provide insights about the candidate's experience level, 
@@ -98,48 +255,46 @@ class AIProcessor:
             3. Skill diversity and depth
             4. Industry expertise
             
-            Resume data: {json.dumps(parsed_data, indent=2)}
+            Resume data: {orjson.dumps(parsed_data).decode()}
             
             Provide response in JSON format with keys: experience_level, career_progression, skill_assessment, industry_expertise
             """
             
-            response = self.gemini_model.generate_content(prompt)
+            response = await self.gemini_model.generate_content_async(
+                prompt,
+                generation_config={"temperature": temperature}
+            )
             
             # Parse response
             response_text = response.text
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            json_text = _extract_json_obj(response_text)
             
-            if json_match:
-                insights = json.loads(json_match.group())
+            if json_text:
+                insights = orjson.loads(json_text)
             else:
                 insights = self._parse_gemini_text(response_text)
             
+            if cache_key:
+                await self.cache.set(cache_key, insights)
+            
             return insights
         
         except Exception as e:
             print(f"GEMINI insights error: {str(e)}")
-            return {
-                "experience_level": self._determine_experience_level(parsed_data),
-                "career_progression": "Unable to analyze",
-                "skill_assessment": "Standard skill set",
-                "industry_expertise": "General"
-            }
+            raise
+
+    def _get_fallback_insights(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Provide fallback insights when GEMINI fails"""
+        return {
+            "experience_level": self._determine_experience_level(self._total_experience(parsed_data)),
+            "career_progression": "Unable to analyze",
+            "skill_assessment": "Standard skill set",
+            "industry_expertise": "General"
+        }
 
     def _create_analysis_prompt(self, parsed_data: Dict[str, Any]) -> str:
-        """Create analysis prompt for AI"""
+        """Create the per-resume part of the analysis prompt"""
         return f"""
-        Analyze this resume and provide a comprehensive assessment. Return your analysis in JSON format with the following structure:
-        {{
-            "strengths": ["list of key strengths"],
-            "weaknesses": ["list of areas for improvement"],
-            "recommendations": ["list of recommendations"],
-            "skills_match": [{{"skill": "skill_name", "confidence": 0.0-1.0}}],
-            "experience_level": "entry|mid|senior|executive",
-            "technical_depth": "basic|intermediate|advanced|expert",
-            "leadership_potential": "low|medium|high",
-            "adaptability_score": 0-100
-        }}
-        
         Resume Data:
         Personal Info: {parsed_data.get('personal_info', {})}
         Skills: {parsed_data.get('skills', [])}
@@ -169,68 +324,30 @@ class AIProcessor:
 
     def _calculate_base_score(self, parsed_data: Dict[str, Any]) -> int:
         """Calculate base score from parsed data"""
-        score = 0
-        
-        # Skills scoring (30 points max)
-        skills = parsed_data.get('skills', [])
-        skills_score = min(30, len(skills) * 2)
-        score += skills_score
-        
-        # Experience scoring (40 points max)
-        experience = parsed_data.get('experience', [])
-        total_experience = sum(exp.get('duration', 0) for exp in experience)
-        experience_score = min(40, total_experience * 8)
-        score += experience_score
-        
-        # Education scoring (20 points max)
         education = parsed_data.get('education', [])
-        if education:
-            education_score = 20
-            # Bonus for advanced degrees
-            for edu in education:
-                degree = edu.get('degree', '').lower()
-                if 'master' in degree or 'phd' in degree or 'doctorate' in degree:
-                    education_score = min(25, education_score + 5)
-                    break
-        else:
-            education_score = 0
-        score += education_score
         
-        # Certifications scoring (10 points max)
-        certifications = parsed_data.get('certifications', [])
-        cert_score = min(10, len(certifications) * 3)
-        score += cert_score
+        # Bonus for advanced degrees
+        has_advanced_degree = False
+        for edu in education:
+            degree = edu.get('degree', '').lower()
+            if 'master' in degree or 'phd' in degree or 'doctorate' in degree:
+                has_advanced_degree = True
+                break
         
-        return min(100, score)
+        return _score_kernel(
+            len(parsed_data.get('skills', [])),
+            self._total_experience(parsed_data),
+            len(education),
+            has_advanced_degree,
+            len(parsed_data.get('certifications', []))
+        )
 
     def _adjust_score_with_ai(self, base_score: int, analysis: Dict[str, Any]) -> int:
         """Adjust score based on AI analysis"""
         adjusted_score = base_score
-        
-        # Adjust based on experience level
-        experience_level = analysis.get('experience_level', 'mid')
-        if experience_level == 'senior':
-            adjusted_score += 5
-        elif experience_level == 'executive':
-            adjusted_score += 10
-        elif experience_level == 'entry':
-            adjusted_score -= 5
-        
-        # Adjust based on technical depth
-        technical_depth = analysis.get('technical_depth', 'intermediate')
-        if technical_depth == 'expert':
-            adjusted_score += 8
-        elif technical_depth == 'advanced':
-            adjusted_score += 5
-        elif technical_depth == 'basic':
-            adjusted_score -= 3
-        
-        # Adjust based on leadership potential
-        leadership = analysis.get('leadership_potential', 'medium')
-        if leadership == 'high':
-            adjusted_score += 5
-        elif leadership == 'low':
-            adjusted_score -= 2
+        adjusted_score += _EXPERIENCE_ADJUSTMENTS.get(analysis.get('experience_level', 'mid'), 0)
+        adjusted_score += _DEPTH_ADJUSTMENTS.get(analysis.get('technical_depth', 'intermediate'), 0)
+        adjusted_score += _LEADERSHIP_ADJUSTMENTS.get(analysis.get('leadership_potential', 'medium'), 0)
         
         # Adjust based on adaptability
         adaptability = analysis.get('adaptability_score', 70)
@@ -241,11 +358,15 @@ class AIProcessor:
         
         return max(0, min(100, adjusted_score))
 
-    def _determine_experience_level(self, parsed_data: Dict[str, Any]) -> str:
-        """Determine experience level from parsed data"""
-        experience = parsed_data.get('experience', [])
-        total_years = sum(exp.get('duration', 0) for exp in experience)
-        
+    def _total_experience(self, parsed_data: Dict[str, Any]) -> float:
+        """Sum experience durations in a single pass"""
+        total_years = 0
+        for exp in parsed_data.get('experience', ()):
+            total_years += exp.get('duration', 0)
+        return total_years
+
+    def _determine_experience_level(self, total_years: float) -> str:
+        """Determine experience level from total years of experience"""
         if total_years < 2:
             return 'entry'
         elif total_years < 5:
@@ -276,7 +397,7 @@ class AIProcessor:
                 "Consider additional certifications"
             ],
             "skills_match": [{"skill": skill, "confidence": 0.7} for skill in skills[:10]],
-            "experience_level": self._determine_experience_level(parsed_data),
+            "experience_level": self._determine_experience_level(self._total_experience(parsed_data)),
             "technical_depth": "intermediate",
             "leadership_potential": "medium",
             "adaptability_score": 70
@@ -296,16 +417,16 @@ class AIProcessor:
         }
         
         # Extract strengths
-        strengths_match = re.search(r'strengths?:?\s*(.+?)(?=weaknesses?|$)', text, re.IGNORECASE | re.DOTALL)
+        strengths_match = _STRENGTHS_RE.search(text)
         if strengths_match:
             strengths_text = strengths_match.group(1)
-            analysis["strengths"] = [s.strip() for s in re.split(r'[•\-\n]', strengths_text) if s.strip()]
+            analysis["strengths"] = [s.strip() for s in _LIST_SPLIT_RE.split(strengths_text) if s.strip()]
         
         # Extract weaknesses
-        weaknesses_match = re.search(r'weaknesses?:?\s*(.+?)(?=recommendations?|$)', text, re.IGNORECASE | re.DOTALL)
+        weaknesses_match = _WEAKNESSES_RE.search(text)
         if weaknesses_match:
             weaknesses_text = weaknesses_match.group(1)
-            analysis["weaknesses"] = [w.strip() for w in re.split(r'[•\-\n]', weaknesses_text) if w.strip()]
+            analysis["weaknesses"] = [w.strip() for w in _LIST_SPLIT_RE.split(weaknesses_text) if w.strip()]
         
         return analysis
 
@@ -339,17 +460,9 @@ class AIProcessor:
             }
             
             for skill in skills:
-                skill_lower = skill.lower()
-                categorized = False
-                
-                for category, keywords in self.skill_categories.items():
-                    if any(keyword in skill_lower for keyword in keywords):
-                        categorized_skills[category].append(skill)
-                        categorized = True
-                        break
-                
-                if not categorized:
-                    categorized_skills['other'].append(skill)
+                matches = [value for _, value in self._skill_automaton.iter(skill.lower())]
+                category = min(matches)[1] if matches else 'other'
+                categorized_skills[category].append(skill)
             
             return {
                 'categorized_skills': categorized_skills,
@@ -367,9 +480,18 @@ class AIProcessor:
                 'diversity_score': 50
             }
 
-    async def generate_interview_questions(self, job_data: Dict[str, Any], candidate_data: Dict[str, Any]) -> List[str]:
+    async def generate_interview_questions(self, job_data: Dict[str, Any], candidate_data: Dict[str, Any],
+                                           use_cache: bool = False) -> List[str]:
         """Generate interview questions based on job and candidate"""
         try:
+            temperature = 0.7
+            cache_key = None
+            if self.cache.should_cache(temperature, opt_in=use_cache):
+                cache_key = self.cache.make_key("interview_questions", {"job": job_data, "candidate": candidate_data})
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             prompt = f"""
             Generate 10 relevant interview questions for this candidate and job position.
             
@@ -389,13 +511,13 @@ class AIProcessor:
             Return as a simple list of questions.
             """
             
-            response = self.groq_client.chat.completions.create(
+            response = await self.groq_client.chat.completions.create(
                 messages=[
                     {"role": "system", "content": "You are an expert interviewer. Generate relevant, insightful interview questions."},
                     {"role": "user", "content": prompt}
                 ],
                 model="mixtral-8x7b-32768",
-                temperature=0.7,
+                temperature=temperature,
                 max_tokens=1500
             )
             
@@ -407,11 +529,16 @@ class AIProcessor:
                 line = line.strip()
                 if line and ('?' in line or line.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '10.'))):
                     # Clean up question
-                    question = re.sub(r'^\d+\.?\s*', '', line)
+                    question = _NUMBER_PREFIX_RE.sub('', line)
                     if question:
                         questions.append(question)
             
-            return questions[:10]  # Return max 10 questions
+            questions = questions[:10]  # Return max 10 questions
+            
+            if cache_key:
+                await self.cache.set(cache_key, questions)
+            
+            return questions
         
         except Exception as e:
             print(f"Question generation error: {str(e)}")
@@ -1,124 +1,202 @@
 import os
-import json
+import asyncio
 import re
-from typing import Dict, List, Any
+import itertools
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 import google.generativeai as genai
-from groq import Groq
+from groq import AsyncGroq
+import ahocorasick
+import orjson
+
+from services.llm_cache import LLMCache
+
+# Entity patterns combined into one regex so the message is scanned once.
+# Patterns are lowercase and run against the lowered message.
+_ENTITY_RE = re.compile(
+    r'\b(?:(?P<title>software engineer|developer|manager|analyst|designer|architect)'
+    r'|(?P<specialty>frontend|backend|full.?stack|devops|data scientist)'
+    r'|(?P<skill>python|java|javascript|react|node\.?js|aws|docker)'
+    r'|(?P<number>\d+))\b'
+)
+
+# Prompt budget for conversation history, in approximate tokens (~4 characters each)
+HISTORY_TOKEN_BUDGET = 1500
+CHARS_PER_TOKEN = 4
+
+# Intent patterns
+INTENT_PATTERNS = {
+    'application_inquiry': [
+        'application', 'apply', 'job application', 'status', 'applied'
+    ],
+    'interview_inquiry': [
+        'interview', 'schedule', 'meeting', 'appointment', 'interview time'
+    ],
+    'resume_inquiry': [
+        'resume', 'cv', 'upload', 'document', 'profile'
+    ],
+    'job_inquiry': [
+        'job', 'position', 'role', 'opening', 'vacancy', 'career'
+    ],
+    'score_inquiry': [
+        'score', 'rating', 'match', 'percentage', 'evaluation'
+    ],
+    'help_request': [
+        'help', 'how', 'what', 'guide', 'tutorial', 'assistance'
+    ],
+    'greeting': [
+        'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening'
+    ],
+    'goodbye': [
+        'bye', 'goodbye', 'see you', 'farewell', 'thanks', 'thank you'
+    ]
+}
+
+def _build_intent_automaton(intent_patterns: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """Keyword automaton over all intent patterns; values carry the intent's priority"""
+    automaton = ahocorasick.Automaton()
+    for rank, (intent, patterns) in enumerate(intent_patterns.items()):
+        for pattern in patterns:
+            if pattern not in automaton:
+                automaton.add_word(pattern, (rank, intent))
+    automaton.make_automaton()
+    return automaton
+
+_INTENT_AUTOMATON = _build_intent_automaton(INTENT_PATTERNS)
+
+# Messages that are nothing but a greeting or goodbye skip the automaton
+_GREETINGS = frozenset(INTENT_PATTERNS['greeting'])
+_GOODBYES = frozenset(INTENT_PATTERNS['goodbye'])
+
+# Response templates
+RESPONSE_TEMPLATES = {
+    'candidate': {
+        'application_inquiry': [
+            "I can help you with your job applications! You can view your application status in the Applications section. Would you like me to guide you through applying for a specific job?",
+            "Let me help you track your applications. You can see all your submitted applications and their current status in your dashboard.",
+            "I can assist with application-related questions. What specific information do you need about your applications?"
+        ],
+        'interview_inquiry': [
+            "I can help you with interview scheduling! You can view your upcoming interviews in the dashboard. Need help preparing for an interview?",
+            "Let me assist with your interviews. You can see scheduled interviews and get preparation tips. What would you like to know?",
+            "I'm here to help with interview-related questions. Would you like tips on interview preparation or information about scheduling?"
+        ],
+        'resume_inquiry': [
+            "I can help you with your resume! Upload your resume in PDF, DOC, or DOCX format for AI analysis and job matching.",
+            "Let me guide you through resume management. Our AI analyzes your resume to provide match scores for jobs. Need help uploading?",
+            "I can assist with resume-related questions. Would you like help uploading your resume or understanding your AI score?"
+        ],
+        'job_inquiry': [
+            "I can help you find jobs! Browse available positions, filter by location and type, and see AI match scores for each role.",
+            "Let me help you explore job opportunities. You can search jobs by keywords, location, and see how well you match each position.",
+            "I can assist with job searching. Would you like help finding positions that match your skills and experience?"
+        ]
+    },
+    'hr': {
+        'application_inquiry': [
+            "I can help you manage candidate applications! View all applications, filter by status, and update candidate progress in the HR dashboard.",
+            "Let me assist with application management. You can review candidates, update statuses, and track the hiring pipeline.",
+            "I can help with candidate applications. Would you like guidance on reviewing applications or updating candidate statuses?"
+        ],
+        'interview_inquiry': [
+            "I can help you schedule and manage interviews! Use the Interview Scheduling section to book appointments and track feedback.",
+            "Let me assist with interview management. You can schedule interviews, send reminders, and collect feedback from interviewers.",
+            "I can help with interview scheduling. Would you like guidance on booking interviews or managing the interview process?"
+        ],
+        'resume_inquiry': [
+            "I can help you review candidate resumes! View AI-parsed data, scores, and detailed analysis for each candidate.",
+            "Let me assist with resume analysis. You can see AI scores, skill matches, and detailed candidate profiles.",
+            "I can help with candidate resume review. Would you like guidance on interpreting AI scores or candidate analysis?"
+        ],
+        'job_inquiry': [
+            "I can help you manage job postings! Create new listings, edit existing ones, and track applications in the Jobs section.",
+            "Let me assist with job management. You can post new positions, update requirements, and monitor application metrics.",
+            "I can help with job posting management. Would you like guidance on creating job listings or tracking applications?"
+        ]
+    }
+}
+
+# Flat (role, intent) lookup of each entry's templates
+_FLAT_TEMPLATES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    (role, intent): tuple(templates)
+    for role, intents in RESPONSE_TEMPLATES.items()
+    for intent, templates in intents.items()
+}
+
+@lru_cache(maxsize=1)
+def _get_groq_client() -> AsyncGroq:
+    """GROQ client, created once per process (async so chat sessions don't block each other)"""
+    return AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+
+@lru_cache(maxsize=1)
+def _get_gemini_model() -> genai.GenerativeModel:
+    """GEMINI model, configured once per process"""
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel('gemini-pro')
 
 class ChatbotService:
     def __init__(self):
-        # Initialize GROQ client
-        self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        # LLM clients are shared by every ChatbotService instance
+        self.groq_client = _get_groq_client()
+        self.gemini_model = _get_gemini_model()
         
-        # Initialize GEMINI
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        self.gemini_model = genai.GenerativeModel('gemini-pro')
+        # Short-lived cache of AI replies to repeated questions
+        self.response_cache = LLMCache(ttl=300)
         
-        # Intent patterns
-        self.intent_patterns = {
-            'application_inquiry': [
-                'application', 'apply', 'job application', 'status', 'applied'
-            ],
-            'interview_inquiry': [
-                'interview', 'schedule', 'meeting', 'appointment', 'interview time'
-            ],
-            'resume_inquiry': [
-                'resume', 'cv', 'upload', 'document', 'profile'
-            ],
-            'job_inquiry': [
-                'job', 'position', 'role', 'opening', 'vacancy', 'career'
-            ],
-            'score_inquiry': [
-                'score', 'rating', 'match', 'percentage', 'evaluation'
-            ],
-            'help_request': [
-                'help', 'how', 'what', 'guide', 'tutorial', 'assistance'
-            ],
-            'greeting': [
-                'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening'
-            ],
-            'goodbye': [
-                'bye', 'goodbye', 'see you', 'farewell', 'thanks', 'thank you'
-            ]
-        }
-        
-        # Response templates
-        self.response_templates = {
-            'candidate': {
-                'application_inquiry': [
-                    "I can help you with your job applications! You can view your application status in the Applications section. Would you like me to guide you through applying for a specific job?",
-                    "Let me help you track your applications. You can see all your submitted applications and their current status in your dashboard.",
-                    "I can assist with application-related questions. What specific information do you need about your applications?"
-                ],
-                'interview_inquiry': [
-                    "I can help you with interview scheduling! You can view your upcoming interviews in the dashboard. Need help preparing for an interview?",
-                    "Let me assist with your interviews. You can see scheduled interviews and get preparation tips. What would you like to know?",
-                    "I'm here to help with interview-related questions. Would you like tips on interview preparation or information about scheduling?"
-                ],
-                'resume_inquiry': [
-                    "I can help you with your resume! Upload your resume in PDF, DOC, or DOCX format for AI analysis and job matching.",
-                    "Let me guide you through resume management. Our AI analyzes your resume to provide match scores for jobs. Need help uploading?",
-                    "I can assist with resume-related questions. Would you like help uploading your resume or understanding your AI score?"
-                ],
-                'job_inquiry': [
-                    "I can help you find jobs! Browse available positions, filter by location and type, and see AI match scores for each role.",
-                    "Let me help you explore job opportunities. You can search jobs by keywords, location, and see how well you match each position.",
-                    "I can assist with job searching. Would you like help finding positions that match your skills and experience?"
-                ]
-            },
-            'hr': {
-                'application_inquiry': [
-                    "I can help you manage candidate applications! View all applications, filter by status, and update candidate progress in the HR dashboard.",
-                    "Let me assist with application management. You can review candidates, update statuses, and track the hiring pipeline.",
-                    "I can help with candidate applications. Would you like guidance on reviewing applications or updating candidate statuses?"
-                ],
-                'interview_inquiry': [
-                    "I can help you schedule and manage interviews! Use the Interview Scheduling section to book appointments and track feedback.",
-                    "Let me assist with interview management. You can schedule interviews, send reminders, and collect feedback from interviewers.",
-                    "I can help with interview scheduling. Would you like guidance on booking interviews or managing the interview process?"
-                ],
-                'resume_inquiry': [
-                    "I can help you review candidate resumes! View AI-parsed data, scores, and detailed analysis for each candidate.",
-                    "Let me assist with resume analysis. You can see AI scores, skill matches, and detailed candidate profiles.",
-                    "I can help with candidate resume review. Would you like guidance on interpreting AI scores or candidate analysis?"
-                ],
-                'job_inquiry': [
-                    "I can help you manage job postings! Create new listings, edit existing ones, and track applications in the Jobs section.",
-                    "Let me assist with job management. You can post new positions, update requirements, and monitor application metrics.",
-                    "I can help with job posting management. Would you like guidance on creating job listings or tracking applications?"
-                ]
-            }
-        }
+        # Circuit breaker: after a GROQ failure, skip it until the cooldown passes
+        self._groq_failures = 0
+        self._groq_cooldown_until = 0.0
+        
+        # Patterns, templates and the derived automaton are built once at import and shared
+        self.intent_patterns = INTENT_PATTERNS
+        self.response_templates = RESPONSE_TEMPLATES
+        self._intent_automaton = _INTENT_AUTOMATON
+        self._greetings = _GREETINGS
+        self._goodbyes = _GOODBYES
+        
+        # Round-robin through each (role, intent)'s templates for variety
+        self._template_cycles = {key: itertools.cycle(templates) for key, templates in _FLAT_TEMPLATES.items()}
 
     async def process_message(self, message: str, conversation_history: List[Dict[str, str]], 
                             user_role: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Process chat message using GROQ + GEMINI"""
         try:
+            # Lowercase once for both intent and entity matching
+            message_lower = message.lower()
+            
             # Detect intent
-            intent = self._detect_intent(message)
+            intent = self._detect_intent(message_lower)
             
             # Get context-aware response
+            cache_hit = False
             if intent in ['greeting', 'goodbye', 'help_request'] or len(conversation_history) < 2:
                 # Use template responses for simple intents
                 response = self._get_template_response(intent, user_role, message)
                 confidence = 0.9
             else:
-                # Use AI for complex queries
-                response = await self._get_ai_response(message, conversation_history, user_role, context, intent)
+                # Use AI for complex queries, reusing a recent answer to the same question
+                cache_key = self._response_cache_key(message, conversation_history, user_role, context, intent)
+                response = await self.response_cache.get(cache_key)
+                cache_hit = response is not None
+                if not cache_hit:
+                    response = await self._get_ai_response(message, conversation_history, user_role, context, intent,
+                                                           cache_key=cache_key)
                 confidence = 0.8
             
             # Extract entities
-            entities = self._extract_entities(message)
+            entities = self._extract_entities(message, message_lower)
             
             # Update context
-            updated_context = self._update_context(context, intent, entities)
+            updated_context = self._update_context_inplace(context, intent, entities)
             
             return {
                 'response': response,
                 'intent': intent,
                 'confidence': confidence,
                 'entities': entities,
-                'updated_context': updated_context
+                'updated_context': updated_context,
+                'cache_hit': cache_hit
             }
         
         except Exception as e:
@@ -128,20 +206,23 @@ class ChatbotService:
                 'intent': 'error',
                 'confidence': 0.0,
                 'entities': [],
-                'updated_context': context
+                'updated_context': context,
+                'cache_hit': False
             }
 
-    def _detect_intent(self, message: str) -> str:
-        """Detect user intent from message"""
-        message_lower = message.lower()
+    def _detect_intent(self, message_lower: str) -> str:
+        """Detect user intent from the lowercased message"""
+        # Only a bare greeting/goodbye can short-circuit; in longer messages other intents win
+        stripped = message_lower.strip(" \t\r\n!.,?")
+        if stripped in self._greetings:
+            return 'greeting'
+        if stripped in self._goodbyes:
+            return 'goodbye'
         
-        # Check each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if pattern in message_lower:
-                    return intent
+        # Intents listed first take priority, wherever they occur in the message
+        matches = [value for _, value in self._intent_automaton.iter(message_lower)]
         
-        return 'general'
+        return min(matches)[1] if matches else 'general'
 
     def _get_template_response(self, intent: str, user_role: str, message: str) -> str:
         """Get template response for simple intents"""
@@ -171,26 +252,79 @@ What specific area would you like help with?"""
 
 What would you like assistance with?"""
         
-        elif intent in self.response_templates.get(user_role, {}):
-            templates = self.response_templates[user_role][intent]
-            return templates[0]  # Return first template
+        templates = self._template_cycles.get((user_role, intent))
+        if templates is not None:
+            return next(templates)
         
-        else:
-            return "I'm your AI assistant for the resume screening platform. I can help you with applications, interviews, job postings, and more. What would you like to know?"
+        return "I'm your AI assistant for the resume screening platform. I can help you with applications, interviews, job postings, and more. What would you like to know?"
 
-    async def _get_ai_response(self, message: str, conversation_history: List[Dict[str, str]], 
-                              user_role: str, context: Dict[str, Any], intent: str) -> str:
-        """Get AI-generated response using GROQ + GEMINI"""
+    def _response_cache_key(self, message: str, conversation_history: List[Dict[str, str]],
+                            user_role: str, context: Dict[str, Any], intent: str) -> str:
+        """Key AI responses by role, intent, normalized message, prompt context and the last few turns"""
+        return self.response_cache.make_key("chat_response", {
+            "user_role": user_role,
+            "intent": intent,
+            "message": message.lower().strip(),
+            "context": {key: value for key, value in context.items() if not key.startswith('_')},
+            "history": conversation_history[-3:]
+        })
+
+    async def stream_message(self, message: str, conversation_history: List[Dict[str, str]],
+                             user_role: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream the chat reply as it is generated"""
+        intent = self._detect_intent(message.lower())
+        
+        # Template replies are ready immediately
+        if intent in ['greeting', 'goodbye', 'help_request'] or len(conversation_history) < 2:
+            yield self._get_template_response(intent, user_role, message)
+            return
+        
         try:
-            # Prepare conversation context
-            conversation_context = self._prepare_conversation_context(conversation_history, user_role, context)
+            prompt = self._build_prompt(message, conversation_history, user_role, context, intent)
+        except Exception as e:
+            # Client-supplied context that can't be serialized still gets the template reply
+            print(f"Chat prompt error: {str(e)}")
+            yield self._get_template_response(intent, user_role, message)
+            return
+        
+        if self._groq_available():
+            streamed = False
+            try:
+                async for token in self._stream_groq(prompt):
+                    streamed = True
+                    yield token
+                self._record_groq_success()
+                return
             
-            # Create prompt for AI
-            prompt = f"""
+            except Exception as groq_error:
+                print(f"GROQ streaming error: {groq_error}")
+                self._record_groq_failure()
+                
+                # Once tokens have gone out the reply can't be restarted
+                if streamed:
+                    return
+        
+        # Fallback to GEMINI, then to the template reply
+        try:
+            yield await self._call_gemini(prompt)
+        except Exception as e:
+            print(f"AI response error: {str(e)}")
+            yield self._get_template_response(intent, user_role, message)
+
+    def _build_prompt(self, message: str, conversation_history: List[Dict[str, str]],
+                      user_role: str, context: Dict[str, Any], intent: str) -> str:
+        """Create the chat prompt for AI"""
+        # Prepare conversation context
+        conversation_context = self._prepare_conversation_context(conversation_history, user_role, context)
+        
+        # Serialize context for the prompt, leaving out internal keys
+        context_json = orjson.dumps({key: value for key, value in context.items() if not key.startswith('_')}).decode()
+        
+        return f"""
             You are an AI assistant for a resume screening platform. 
             User role: {user_role}
             Detected intent: {intent}
-            Context: {json.dumps(context)}
+            Context: {context_json}
             
             Conversation history:
             {conversation_context}
@@ -201,94 +335,155 @@ What would you like assistance with?"""
             Keep responses concise and actionable. If the user needs to perform an action,
             guide them to the appropriate section of the platform.
             """
-            
-            # Try GROQ first
-            try:
-                response = self.groq_client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are a helpful AI assistant for a resume screening platform."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    model="mixtral-8x7b-32768",
-                    temperature=0.7,
-                    max_tokens=500
-                )
-                
-                return response.choices[0].message.content.strip()
-            
-            except Exception as groq_error:
-                print(f"GROQ error: {groq_error}")
-                
-                # Fallback to GEMINI
-                response = self.gemini_model.generate_content(prompt)
-                return response.text.strip()
-        
+
+    async def _get_ai_response(self, message: str, conversation_history: List[Dict[str, str]], 
+                              user_role: str, context: Dict[str, Any], intent: str,
+                              cache_key: Optional[str] = None) -> str:
+        """Get AI-generated response using GROQ + GEMINI"""
+        try:
+            prompt = self._build_prompt(message, conversation_history, user_role, context, intent)
         except Exception as e:
-            print(f"AI response error: {str(e)}")
+            # Client-supplied context that can't be serialized still gets the template reply
+            print(f"Chat prompt error: {str(e)}")
             return self._get_template_response(intent, user_role, message)
+        
+        # Race GROQ and GEMINI so a failing provider doesn't add its latency to the other's;
+        # GROQ sits out while its circuit is open
+        calls = [self._call_gemini(prompt)]
+        if self._groq_available():
+            calls.append(self._call_groq(prompt))
+        ai_response = await self._first_successful(*calls)
+        
+        # Both providers failing is an expected outcome, answered from the templates
+        if ai_response is None:
+            return self._get_template_response(intent, user_role, message)
+        
+        if cache_key:
+            await self.response_cache.set(cache_key, ai_response)
+        
+        return ai_response
+
+    async def _call_groq(self, prompt: str) -> str:
+        """Get a chat reply from GROQ"""
+        try:
+            response = await self.groq_client.chat.completions.create(
+                messages=[
+                    {"role": "system", "content": "You are a helpful AI assistant for a resume screening platform."},
+                    {"role": "user", "content": prompt}
+                ],
+                model="mixtral-8x7b-32768",
+                temperature=0.7,
+                max_tokens=500
+            )
+        except Exception:
+            self._record_groq_failure()
+            raise
+        
+        self._record_groq_success()
+        return response.choices[0].message.content.strip()
+
+    def _groq_available(self) -> bool:
+        """Whether GROQ's circuit is closed"""
+        return time.monotonic() >= self._groq_cooldown_until
+
+    def _record_groq_failure(self) -> None:
+        """Open GROQ's circuit, backing off exponentially up to a minute"""
+        self._groq_cooldown_until = time.monotonic() + min(60, 2 ** self._groq_failures)
+        self._groq_failures += 1
+
+    def _record_groq_success(self) -> None:
+        """Close GROQ's circuit and reset the backoff"""
+        self._groq_failures = 0
+        self._groq_cooldown_until = 0.0
+
+    async def _stream_groq(self, prompt: str) -> AsyncIterator[str]:
+        """Stream a chat reply from GROQ token by token"""
+        stream = await self.groq_client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are a helpful AI assistant for a resume screening platform."},
+                {"role": "user", "content": prompt}
+            ],
+            model="mixtral-8x7b-32768",
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            token = chunk.choices[0].delta.content
+            if token:
+                yield token
+
+    async def _call_gemini(self, prompt: str) -> str:
+        """Get a chat reply from GEMINI"""
+        response = await self.gemini_model.generate_content_async(prompt)
+        return response.text.strip()
+
+    async def _first_successful(self, *calls) -> Optional[str]:
+        """Return the first successful result, cancelling the rest; None if every call fails"""
+        pending = {asyncio.create_task(call) for call in calls}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    print(f"AI provider error: {task.exception()}")
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
 
     def _prepare_conversation_context(self, conversation_history: List[Dict[str, str]], 
                                     user_role: str, context: Dict[str, Any]) -> str:
         """Prepare conversation context for AI"""
         context_lines = []
+        budget = HISTORY_TOKEN_BUDGET * CHARS_PER_TOKEN
         
-        # Add recent conversation history (last 6 messages)
-        recent_history = conversation_history[-6:] if len(conversation_history) > 6 else conversation_history
-        
-        for msg in recent_history:
+        # Walk back through the last 6 messages until the token budget is spent;
+        # an oversized latest message is clipped rather than dropped
+        for msg in reversed(conversation_history[-6:]):
             role = "User" if msg.get('role') == 'user' else "Assistant"
             content = msg.get('content', '')
-            context_lines.append(f"{role}: {content}")
+            line = f"{role}: {content}"
+            
+            if len(line) > budget:
+                if not context_lines:
+                    context_lines.append(line[:budget])
+                break
+            
+            budget -= len(line)
+            context_lines.append(line)
         
+        context_lines.reverse()
         return '\n'.join(context_lines)
 
-    def _extract_entities(self, message: str) -> List[Dict[str, Any]]:
+    def _extract_entities(self, message: str, message_lower: str) -> List[Dict[str, Any]]:
         """Extract entities from message"""
-        entities = []
+        # Bucket by kind so entities keep their type grouping
+        buckets = {'title': [], 'specialty': [], 'skill': [], 'number': []}
         
-        # Extract job titles
-        job_patterns = [
-            r'\b(software engineer|developer|manager|analyst|designer|architect)\b',
-            r'\b(frontend|backend|full.?stack|devops|data scientist)\b'
-        ]
+        # Report values in the user's casing when lowering didn't shift offsets
+        source = message if len(message) == len(message_lower) else message_lower
         
-        for pattern in job_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                entities.append({
-                    'type': 'job_title',
-                    'value': match,
-                    'confidence': 0.8
-                })
-        
-        # Extract skills
-        skill_patterns = [
-            r'\b(python|java|javascript|react|node\.?js|aws|docker)\b'
-        ]
+        for match in _ENTITY_RE.finditer(message_lower):
+            kind = match.lastgroup
+            value = source[match.start(kind):match.end(kind)]
+            
+            if kind == 'number':
+                # Numbers could be scores, years, etc.
+                buckets[kind].append({'type': 'number', 'value': int(value), 'confidence': 0.7})
+            elif kind == 'skill':
+                buckets[kind].append({'type': 'skill', 'value': value, 'confidence': 0.9})
+            else:
+                buckets[kind].append({'type': 'job_title', 'value': value, 'confidence': 0.8})
         
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            for match in matches:
-                entities.append({
-                    'type': 'skill',
-                    'value': match,
-                    'confidence': 0.9
-                })
-        
-        # Extract numbers (could be scores, years, etc.)
-        number_matches = re.findall(r'\b(\d+)\b', message)
-        for match in number_matches:
-            entities.append({
-                'type': 'number',
-                'value': int(match),
-                'confidence': 0.7
-            })
-        
-        return entities
+        return buckets['title'] + buckets['specialty'] + buckets['skill'] + buckets['number']
 
-    def _update_context(self, context: Dict[str, Any], intent: str, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Update conversation context"""
-        updated_context = context.copy()
+    def _update_context_inplace(self, context: Dict[str, Any], intent: str, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Update conversation context in place and return the same dict"""
+        # The context belongs to this request, so it is mutated rather than copied each turn
+        updated_context = context
         
         # Update last intent
         updated_context['last_intent'] = intent
@@ -297,20 +492,15 @@ What would you like assistance with?"""
         if intent != 'general':
             updated_context['current_topic'] = intent.split('_')[0]
         
-        # Add entities to context
+        # Add entities to context (keep last 10), trimming in place rather than re-slicing
         if entities:
-            if 'entities' not in updated_context:
-                updated_context['entities'] = []
-            
-            # Add new entities (keep last 10)
-            updated_context['entities'].extend(entities)
-            updated_context['entities'] = updated_context['entities'][-10:]
+            context_entities = updated_context.setdefault('entities', [])
+            context_entities.extend(entities)
+            del context_entities[:-10]
         
         # Track conversation flow
-        if 'conversation_flow' not in updated_context:
-            updated_context['conversation_flow'] = []
-        
-        updated_context['conversation_flow'].append(intent)
-        updated_context['conversation_flow'] = updated_context['conversation_flow'][-5:]  # Keep last 5 intents
+        conversation_flow = updated_context.setdefault('conversation_flow', [])
+        conversation_flow.append(intent)
+        del conversation_flow[:-5]  # Keep last 5 intents
         
         return updated_context
\ No newline at end of file
@@ -1,17 +1,68 @@
+import os
 import asyncio
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import joblib
+import ahocorasick
+from sklearn.base import clone
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.pipeline import make_pipeline
 import re
 
+# Where the corpus-fitted TF-IDF model is persisted between restarts; relative
+# paths resolve against the ai-service directory, not the working directory
+_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TFIDF_MODEL_PATH = os.path.join(_SERVICE_DIR, os.getenv("TFIDF_MODEL_PATH", "models/tfidf_vectorizer.joblib"))
+
+# Required-experience patterns, most specific first
+_EXPERIENCE_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:relevant\s*)?experience',
+    r'minimum\s*(?:of\s*)?(\d+)\s*years?',
+    r'at\s*least\s*(\d+)\s*years?'
+])
+
+def _ranked_automaton(groups: List[Tuple[List[str], Any]]) -> ahocorasick.Automaton:
+    """Keyword automaton over ranked groups; each value is (rank, group value)"""
+    automaton = ahocorasick.Automaton()
+    for rank, (keywords, value) in enumerate(groups):
+        for keyword in keywords:
+            if keyword not in automaton:
+                automaton.add_word(keyword, (rank, value))
+    automaton.make_automaton()
+    return automaton
+
+def _first_ranked(automaton: ahocorasick.Automaton, text: str, default: Any) -> Any:
+    """Value of the highest-ranked group with a keyword anywhere in the text"""
+    matches = [value for _, value in automaton.iter(text)]
+    return min(matches)[1] if matches else default
+
 class JobMatcher:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2)
-        )
+        # Hashed features need no fitted vocabulary; cheaper cold starts for a small accuracy loss
+        self.use_hashing = os.getenv("TFIDF_HASHING", "0") == "1"
+        
+        # Pairwise fallback until a corpus model exists; the TF-IDF variant is refit on each pair
+        if self.use_hashing:
+            self.vectorizer = HashingVectorizer(
+                stop_words='english',
+                ngram_range=(1, 2),
+                n_features=2 ** 18,
+                alternate_sign=False,
+                norm='l2',
+                dtype=np.float32
+            )
+        else:
+            self.vectorizer = TfidfVectorizer(
+                stop_words='english',
+                max_features=1000,
+                ngram_range=(1, 2),
+                dtype=np.float32
+            )
+        
+        # Vocabulary and IDF fitted once on jobs + resumes; matching then only transforms
+        self.corpus_vectorizer = self._load_corpus_vectorizer()
         
         # Skill importance weights
         self.skill_weights = {
@@ -33,63 +84,285 @@ class JobMatcher:
             'principal': 5,
             'executive': 6
         }
+        
+        # Skill synonyms
+        self.skill_synonyms = {
+            'javascript': ['js', 'node.js', 'nodejs'],
+            'python': ['py'],
+            'react': ['reactjs', 'react.js'],
+            'angular': ['angularjs'],
+            'vue': ['vuejs', 'vue.js'],
+            'aws': ['amazon web services'],
+            'gcp': ['google cloud platform'],
+            'azure': ['microsoft azure'],
+            'docker': ['containerization'],
+            'kubernetes': ['k8s'],
+            'postgresql': ['postgres'],
+            'mongodb': ['mongo']
+        }
+        
+        # Every alias maps to its canonical skill, so synonyms compare equal
+        self._skill_canon = {
+            alias: main_skill
+            for main_skill, aliases in self.skill_synonyms.items()
+            for alias in aliases
+        }
+        
+        # Keyword groups scanned in one pass each; earlier groups win when several match
+        self._skill_bonus_automaton = _ranked_automaton([
+            (['python', 'java', 'javascript', 'c++', 'c#'], 5),       # Programming languages
+            (['react', 'angular', 'vue', 'django', 'spring'], 3),     # Frameworks
+            (['aws', 'azure', 'gcp', 'docker', 'kubernetes'], 4)      # Cloud technologies
+        ])
+        self._required_level_automaton = _ranked_automaton([
+            (['senior', 'sr.', 'lead', 'principal'], 'senior'),
+            (['junior', 'jr.', 'entry', 'graduate'], 'junior'),
+            (['mid', 'intermediate'], 'mid')
+        ])
+        self._title_years_automaton = _ranked_automaton([
+            (['senior', 'lead', 'principal'], 5),
+            (['mid', 'intermediate'], 3),
+            (['junior', 'entry'], 1)
+        ])
+        self._degree_automaton = _ranked_automaton([
+            (['phd', 'doctorate'], 'phd'),
+            (['master'], 'master'),
+            (['bachelor'], 'bachelor'),
+            (['associate'], 'associate'),
+            (['high_school'], 'high_school')
+        ])
+        self._degree_requirement_automaton = _ranked_automaton([
+            (['degree', 'bachelor', 'master', 'phd', 'education'], True)
+        ])
+        self._required_degree_automaton = _ranked_automaton([
+            (['phd', 'doctorate'], 'phd'),
+            (['master', 'mba'], 'master'),
+            (['bachelor', 'degree'], 'bachelor')
+        ])
+        
+        # Industry keywords, all found in one pass over the text
+        self.industries = {
+            'fintech': ['finance', 'banking', 'fintech', 'payment', 'trading'],
+            'healthcare': ['healthcare', 'medical', 'hospital', 'pharma'],
+            'ecommerce': ['ecommerce', 'retail', 'shopping', 'marketplace'],
+            'saas': ['saas', 'software', 'platform', 'cloud'],
+            'gaming': ['gaming', 'game', 'entertainment'],
+            'education': ['education', 'learning', 'university', 'school']
+        }
+        self._industry_automaton = ahocorasick.Automaton()
+        for industry, keywords in self.industries.items():
+            for keyword in keywords:
+                self._industry_automaton.add_word(keyword, industry)
+        self._industry_automaton.make_automaton()
+        
+        # Job-side extractors are pure in their string inputs and repeat for every resume
+        # matched against the same job, so each instance memoizes them
+        self._extract_required_experience = lru_cache(maxsize=4096)(self._extract_required_experience)
+        self._extract_required_level = lru_cache(maxsize=4096)(self._extract_required_level)
+        self._extract_required_degree = lru_cache(maxsize=4096)(self._extract_required_degree)
+        self._extract_industry_keywords = lru_cache(maxsize=4096)(self._extract_industry_keywords)
+        
+        # Skill categories come from a small vocabulary, so after the first sighting
+        # each skill's bonus is a single dict probe
+        self._skill_bonus = lru_cache(maxsize=4096)(self._skill_bonus)
+        
+        # The same resume or job is often re-scored against others; similarities are
+        # memoized per text pair and dropped whenever the corpus model changes
+        self._pair_similarity = lru_cache(maxsize=1024)(self._pair_similarity)
+
+    def fit_corpus(self, texts: List[str], save: bool = False) -> None:
+        """Fit the TF-IDF vocabulary and IDF weights once on a corpus; save=True writes TFIDF_MODEL_PATH"""
+        if self.use_hashing:
+            # Only the IDF weights are learned; the hashed feature space is fixed
+            vectorizer = make_pipeline(
+                HashingVectorizer(
+                    stop_words='english',
+                    ngram_range=(1, 2),
+                    n_features=2 ** 18,
+                    alternate_sign=False,
+                    norm=None,
+                    dtype=np.float32
+                ),
+                TfidfTransformer(sublinear_tf=True, norm='l2')
+            )
+        else:
+            vectorizer = TfidfVectorizer(
+                stop_words='english',
+                max_features=20000,
+                ngram_range=(1, 2),
+                sublinear_tf=True,
+                min_df=2,
+                max_df=0.95,
+                norm='l2',
+                dtype=np.float32
+            )
+        
+        vectorizer.fit(texts)
+        self.corpus_vectorizer = vectorizer
+        self._pair_similarity.cache_clear()
+        
+        if save:
+            try:
+                os.makedirs(os.path.dirname(TFIDF_MODEL_PATH) or '.', exist_ok=True)
+                joblib.dump(vectorizer, TFIDF_MODEL_PATH)
+            except Exception as e:
+                print(f"TF-IDF model save error: {str(e)}")
+
+    def _load_corpus_vectorizer(self) -> Optional[Any]:
+        """Load a previously fitted corpus vectorizer, if one was saved"""
+        if not os.path.exists(TFIDF_MODEL_PATH):
+            return None
+        
+        try:
+            return joblib.load(TFIDF_MODEL_PATH)
+        except Exception as e:
+            print(f"TF-IDF model load error: {str(e)}")
+            return None
 
     async def calculate_match(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate job match score using multiple factors"""
         try:
-            # Extract relevant data
-            resume_skills = resume_data.get('skills', [])
-            resume_experience = resume_data.get('experience', [])
-            resume_education = resume_data.get('education', [])
-            
-            job_requirements = job_data.get('requirements', [])
-            job_title = job_data.get('title', '')
-            job_description = job_data.get('description', '')
-            job_skills = job_data.get('skills', [])
-            
-            # Calculate different match components
-            skills_match = self._calculate_skills_match(resume_skills, job_requirements + job_skills)
-            experience_match = self._calculate_experience_match(resume_experience, job_data)
-            education_match = self._calculate_education_match(resume_education, job_data)
-            semantic_match = await self._calculate_semantic_match(resume_data, job_data)
-            
-            # Weighted final score
-            final_score = (
-                skills_match['score'] * 0.4 +
-                experience_match['score'] * 0.3 +
-                semantic_match['score'] * 0.2 +
-                education_match['score'] * 0.1
-            )
-            
-            # Determine recommendation
-            recommendation = self._get_recommendation(final_score, skills_match, experience_match)
-            
-            return {
-                'score': round(final_score),
-                'recommendation': recommendation,
-                'breakdown': {
-                    'skills_match': skills_match,
-                    'experience_match': experience_match,
-                    'education_match': education_match,
-                    'semantic_match': semantic_match
-                },
-                'matching_skills': skills_match.get('matching_skills', []),
-                'missing_skills': skills_match.get('missing_skills', []),
-                'experience_gap': experience_match.get('gap_analysis', ''),
-                'recommendations': self._generate_recommendations(skills_match, experience_match)
-            }
+            # Scoring is CPU-bound, so it runs in a worker thread instead of blocking the event loop
+            return await asyncio.to_thread(self._score_pair, resume_data, job_data)
         
         except Exception as e:
             print(f"Job matching error: {str(e)}")
-            return {
-                'score': 50,
-                'recommendation': 'maybe',
-                'breakdown': {},
-                'matching_skills': [],
-                'missing_skills': [],
-                'experience_gap': '',
-                'recommendations': []
-            }
+            return self._default_match()
+
+    async def calculate_matches_batch(self, resumes: List[Dict[str, Any]],
+                                      jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Match every resume against every job; result[i][j] scores resumes[i] against jobs[j]"""
+        return await asyncio.to_thread(self._score_batch, resumes, jobs)
+
+    def _score_pair(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Score one resume against one job"""
+        semantic_match = self._calculate_semantic_match(resume_data, job_data)
+        return self._combine_match(resume_data, job_data, semantic_match)
+
+    def _score_batch(self, resumes: List[Dict[str, Any]], jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Score every resume/job pair, taking semantic similarity from one sparse matmul"""
+        # Vectorizers reject empty input, and there is nothing to score anyway
+        if not resumes:
+            return []
+        if not jobs:
+            return [[] for _ in resumes]
+        
+        resume_texts = [self._prepare_resume_text(resume_data) for resume_data in resumes]
+        job_texts = [self._prepare_job_text(job_data) for job_data in jobs]
+        
+        jobs_lower = [self._normalize_job(job_data) for job_data in jobs]
+        
+        similarities = self._similarity_matrix(resume_texts, job_texts)
+        
+        results = []
+        failures = 0
+        first_error = None
+        for i, resume_data in enumerate(resumes):
+            row = []
+            for j, job_data in enumerate(jobs):
+                try:
+                    if not resume_texts[i] or not job_texts[j]:
+                        semantic_match = {'score': 50, 'similarity': 0.5}
+                    elif similarities is None:
+                        semantic_match = self._calculate_semantic_match(resume_data, job_data)
+                    else:
+                        semantic_match = self._semantic_result(float(similarities[i, j]))
+                    
+                    row.append(self._combine_match(resume_data, job_data, semantic_match, jobs_lower[j]))
+                
+                except Exception as e:
+                    # Reported once per batch, so a systematic failure doesn't flood stdout
+                    failures += 1
+                    first_error = first_error or e
+                    row.append(self._default_match())
+            
+            results.append(row)
+        
+        if failures:
+            print(f"Job matching error: {failures} of {len(resumes) * len(jobs)} pairs failed, first: {str(first_error)}")
+        
+        return results
+
+    def _similarity_matrix(self, resume_texts: List[str], job_texts: List[str]) -> Optional[np.ndarray]:
+        """Cosine similarity of every resume/job pair as one sparse matmul; None without a corpus model"""
+        # The corpus model is fitted offline and loaded at startup; requests never fit it
+        if self.corpus_vectorizer is None:
+            return None
+        
+        resume_matrix = self.corpus_vectorizer.transform(resume_texts)
+        job_matrix = self.corpus_vectorizer.transform(job_texts)
+        
+        # Rows are L2-normalized, so R @ J.T holds every pairwise cosine similarity
+        return (resume_matrix @ job_matrix.T).toarray()
+
+    def _combine_match(self, resume_data: Dict[str, Any], job_data: Dict[str, Any],
+                       semantic_match: Dict[str, Any],
+                       job_lower: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Combine the per-component scores into the final match result"""
+        if job_lower is None:
+            job_lower = self._normalize_job(job_data)
+        
+        # Extract relevant data
+        resume_skills = resume_data.get('skills', [])
+        resume_experience = resume_data.get('experience', [])
+        resume_education = resume_data.get('education', [])
+        
+        job_requirements = job_data.get('requirements', [])
+        job_title = job_data.get('title', '')
+        job_description = job_data.get('description', '')
+        job_skills = job_data.get('skills', [])
+        
+        # Calculate different match components
+        skills_match = self._calculate_skills_match(resume_skills, job_requirements + job_skills)
+        experience_match = self._calculate_experience_match(resume_experience, job_lower)
+        education_match = self._calculate_education_match(resume_education, job_lower)
+        
+        # Weighted final score
+        final_score = (
+            skills_match['score'] * 0.4 +
+            experience_match['score'] * 0.3 +
+            semantic_match['score'] * 0.2 +
+            education_match['score'] * 0.1
+        )
+        
+        # Determine recommendation
+        recommendation = self._get_recommendation(final_score, skills_match, experience_match)
+        
+        return {
+            'score': round(final_score),
+            'recommendation': recommendation,
+            'breakdown': {
+                'skills_match': skills_match,
+                'experience_match': experience_match,
+                'education_match': education_match,
+                'semantic_match': semantic_match
+            },
+            'matching_skills': skills_match.get('matching_skills', []),
+            'missing_skills': skills_match.get('missing_skills', []),
+            'experience_gap': experience_match.get('gap_analysis', ''),
+            'recommendations': self._generate_recommendations(skills_match, experience_match)
+        }
+
+    def _normalize_job(self, job_data: Dict[str, Any]) -> Dict[str, str]:
+        """Lowercase the job fields the match components read, once per job"""
+        return {
+            'title': job_data.get('title', '').lower(),
+            'description': job_data.get('description', '').lower(),
+            'company': job_data.get('company', '').lower(),
+            'requirements': ' '.join(job_data.get('requirements', [])).lower()
+        }
+
+    def _default_match(self) -> Dict[str, Any]:
+        """Neutral result returned when matching fails"""
+        return {
+            'score': 50,
+            'recommendation': 'maybe',
+            'breakdown': {},
+            'matching_skills': [],
+            'missing_skills': [],
+            'experience_gap': '',
+            'recommendations': []
+        }
 
     def _calculate_skills_match(self, resume_skills: List[str], job_requirements: List[str]) -> Dict[str, Any]:
         """Calculate skills match score"""
@@ -98,7 +371,7 @@ class JobMatcher:
         
         # Normalize skills for comparison
         resume_skills_lower = [skill.lower().strip() for skill in resume_skills]
-        job_requirements_lower = [req.lower().strip() for req in job_requirements]
+        resume_skills_canon = frozenset(self._canon_skill(skill) for skill in resume_skills_lower)
         
         matching_skills = []
         missing_skills = []
@@ -106,22 +379,13 @@ class JobMatcher:
         for requirement in job_requirements:
             requirement_lower = requirement.lower().strip()
             
-            # Check for exact matches
-            if requirement_lower in resume_skills_lower:
+            # Exact or synonym match is a single set probe; only the rest need a substring scan
+            if (self._canon_skill(requirement_lower) in resume_skills_canon or
+                any(requirement_lower in resume_skill or resume_skill in requirement_lower
+                    for resume_skill in resume_skills_lower)):
                 matching_skills.append(requirement)
             else:
-                # Check for partial matches
-                partial_match = False
-                for resume_skill in resume_skills_lower:
-                    if (requirement_lower in resume_skill or 
-                        resume_skill in requirement_lower or
-                        self._are_similar_skills(requirement_lower, resume_skill)):
-                        matching_skills.append(requirement)
-                        partial_match = True
-                        break
-                
-                if not partial_match:
-                    missing_skills.append(requirement)
+                missing_skills.append(requirement)
         
         # Calculate score
         if job_requirements:
@@ -139,7 +403,7 @@ class JobMatcher:
             'match_ratio': len(matching_skills) / len(job_requirements) if job_requirements else 0
         }
 
-    def _calculate_experience_match(self, resume_experience: List[Dict], job_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_experience_match(self, resume_experience: List[Dict], job_lower: Dict[str, str]) -> Dict[str, Any]:
         """Calculate experience match score"""
         if not resume_experience:
             return {'score': 0, 'gap_analysis': 'No experience data available'}
@@ -148,8 +412,8 @@ class JobMatcher:
         total_years = sum(exp.get('duration', 0) for exp in resume_experience)
         
         # Determine required experience from job
-        job_title = job_data.get('title', '').lower()
-        job_description = job_data.get('description', '').lower()
+        job_title = job_lower['title']
+        job_description = job_lower['description']
         
         required_years = self._extract_required_experience(job_title, job_description)
         
@@ -171,7 +435,7 @@ class JobMatcher:
         level_score = self._calculate_level_alignment(resume_level, required_level)
         
         # Industry/domain experience
-        domain_score = self._calculate_domain_match(resume_experience, job_data)
+        domain_score = self._calculate_domain_match(resume_experience, job_lower)
         
         final_score = (years_score * 0.5 + level_score * 0.3 + domain_score * 0.2)
         
@@ -187,19 +451,17 @@ class JobMatcher:
             'gap_analysis': gap_analysis
         }
 
-    def _calculate_education_match(self, resume_education: List[Dict], job_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_education_match(self, resume_education: List[Dict], job_lower: Dict[str, str]) -> Dict[str, Any]:
         """Calculate education match score"""
         if not resume_education:
             return {'score': 50, 'analysis': 'No education data available'}
         
-        job_description = job_data.get('description', '').lower()
-        job_requirements = job_data.get('requirements', [])
+        job_description = job_lower['description']
+        job_requirements = job_lower['requirements']
         
         # Check for degree requirements
-        requires_degree = any(
-            keyword in job_description or any(keyword in req.lower() for req in job_requirements)
-            for keyword in ['degree', 'bachelor', 'master', 'phd', 'education']
-        )
+        requires_degree = _first_ranked(self._degree_requirement_automaton,
+                                        f"{job_description} {job_requirements}", False)
         
         if not requires_degree:
             return {'score': 100, 'analysis': 'No specific education requirements'}
@@ -232,7 +494,7 @@ class JobMatcher:
             'analysis': f"Has {highest_degree}, requires {required_degree}"
         }
 
-    async def _calculate_semantic_match(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_semantic_match(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate semantic similarity between resume and job"""
         try:
             # Prepare text for comparison
@@ -242,49 +504,44 @@ class JobMatcher:
             if not resume_text or not job_text:
                 return {'score': 50, 'similarity': 0.5}
             
-            # Calculate TF-IDF similarity
-            documents = [resume_text, job_text]
-            tfidf_matrix = self.vectorizer.fit_transform(documents)
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
-            # Convert to percentage
-            score = similarity * 100
+            similarity = self._pair_similarity(resume_text, job_text)
             
-            return {
-                'score': round(score),
-                'similarity': similarity,
-                'analysis': f"Semantic similarity: {similarity:.2f}"
-            }
+            return self._semantic_result(similarity)
         
         except Exception as e:
             print(f"Semantic matching error: {str(e)}")
             return {'score': 50, 'similarity': 0.5, 'analysis': 'Unable to calculate semantic similarity'}
 
-    def _are_similar_skills(self, skill1: str, skill2: str) -> bool:
-        """Check if two skills are similar"""
-        # Define skill synonyms
-        synonyms = {
-            'javascript': ['js', 'node.js', 'nodejs'],
-            'python': ['py'],
-            'react': ['reactjs', 'react.js'],
-            'angular': ['angularjs'],
-            'vue': ['vuejs', 'vue.js'],
-            'aws': ['amazon web services'],
-            'gcp': ['google cloud platform'],
-            'azure': ['microsoft azure'],
-            'docker': ['containerization'],
-            'kubernetes': ['k8s'],
-            'postgresql': ['postgres'],
-            'mongodb': ['mongo']
-        }
+    def _pair_similarity(self, resume_text: str, job_text: str) -> float:
+        """TF-IDF cosine similarity of one resume/job text pair"""
+        # Calculate TF-IDF similarity, refitting on the pair only when no corpus model exists
+        documents = [resume_text, job_text]
+        if self.corpus_vectorizer is not None:
+            tfidf_matrix = self.corpus_vectorizer.transform(documents)
+        elif self.use_hashing:
+            # Stateless, so there is nothing to fit or copy
+            tfidf_matrix = self.vectorizer.transform(documents)
+        else:
+            # Fit a fresh copy so concurrent worker threads don't share fitted state
+            tfidf_matrix = clone(self.vectorizer).fit_transform(documents)
         
-        for main_skill, skill_synonyms in synonyms.items():
-            if ((skill1 == main_skill and skill2 in skill_synonyms) or
-                (skill2 == main_skill and skill1 in skill_synonyms) or
-                (skill1 in skill_synonyms and skill2 in skill_synonyms)):
-                return True
+        # Rows are L2-normalized, so cosine similarity is just their dot product
+        return float(tfidf_matrix[0].multiply(tfidf_matrix[1]).sum())
+
+    def _semantic_result(self, similarity: float) -> Dict[str, Any]:
+        """Semantic match component for a cosine similarity"""
+        # Convert to percentage
+        score = similarity * 100
         
-        return False
+        return {
+            'score': round(score),
+            'similarity': similarity,
+            'analysis': f"Semantic similarity: {similarity:.2f}"
+        }
+
+    def _canon_skill(self, skill: str) -> str:
+        """Map a normalized skill to its canonical name"""
+        return self._skill_canon.get(skill, skill)
 
     def _apply_skill_weights(self, matching_skills: List[str], base_score: float) -> float:
         """Apply importance weights to skills"""
@@ -295,48 +552,26 @@ class JobMatcher:
         weighted_score = base_score
         
         for skill in matching_skills:
-            skill_lower = skill.lower()
-            
-            # Programming languages get higher weight
-            if any(lang in skill_lower for lang in ['python', 'java', 'javascript', 'c++', 'c#']):
-                weighted_score += 5
-            
-            # Frameworks get medium weight
-            elif any(framework in skill_lower for framework in ['react', 'angular', 'vue', 'django', 'spring']):
-                weighted_score += 3
-            
-            # Cloud technologies get high weight
-            elif any(cloud in skill_lower for cloud in ['aws', 'azure', 'gcp', 'docker', 'kubernetes']):
-                weighted_score += 4
+            weighted_score += self._skill_bonus(skill.lower())
         
         return min(100, weighted_score)
 
+    def _skill_bonus(self, skill_lower: str) -> int:
+        """Score bonus for a matched skill's category"""
+        return _first_ranked(self._skill_bonus_automaton, skill_lower, 0)
+
     def _extract_required_experience(self, job_title: str, job_description: str) -> int:
-        """Extract required years of experience from job posting"""
-        text = f"{job_title} {job_description}".lower()
+        """Extract required years of experience from the lowercased job posting"""
+        text = f"{job_title} {job_description}"
         
         # Look for experience patterns
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:relevant\s*)?experience',
-            r'minimum\s*(?:of\s*)?(\d+)\s*years?',
-            r'at\s*least\s*(\d+)\s*years?'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _EXPERIENCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return int(match.group(1))
         
         # Default based on job title
-        if any(level in job_title for level in ['senior', 'lead', 'principal']):
-            return 5
-        elif any(level in job_title for level in ['mid', 'intermediate']):
-            return 3
-        elif any(level in job_title for level in ['junior', 'entry']):
-            return 1
-        
-        return 2  # Default
+        return _first_ranked(self._title_years_automaton, job_title, 2)
 
     def _determine_experience_level(self, years: float) -> str:
         """Determine experience level from years"""
@@ -352,17 +587,10 @@ class JobMatcher:
             return 'executive'
 
     def _extract_required_level(self, job_title: str, job_description: str) -> str:
-        """Extract required experience level"""
-        text = f"{job_title} {job_description}".lower()
-        
-        if any(level in text for level in ['senior', 'sr.', 'lead', 'principal']):
-            return 'senior'
-        elif any(level in text for level in ['junior', 'jr.', 'entry', 'graduate']):
-            return 'junior'
-        elif any(level in text for level in ['mid', 'intermediate']):
-            return 'mid'
+        """Extract required experience level from the lowercased job posting"""
+        text = f"{job_title} {job_description}"
         
-        return 'mid'  # Default
+        return _first_ranked(self._required_level_automaton, text, 'mid')
 
     def _calculate_level_alignment(self, resume_level: str, required_level: str) -> float:
         """Calculate alignment between experience levels"""
@@ -378,76 +606,50 @@ class JobMatcher:
         else:
             return 40
 
-    def _calculate_domain_match(self, resume_experience: List[Dict], job_data: Dict[str, Any]) -> float:
+    def _calculate_domain_match(self, resume_experience: List[Dict], job_lower: Dict[str, str]) -> float:
         """Calculate domain/industry experience match"""
         # This is a simplified implementation
         # In practice, you'd use more sophisticated industry classification
         
-        job_company = job_data.get('company', '').lower()
-        job_description = job_data.get('description', '').lower()
+        job_company = job_lower['company']
+        job_description = job_lower['description']
         
         # Extract industry keywords from job
         job_industries = self._extract_industry_keywords(f"{job_company} {job_description}")
         
-        # Extract industries from resume experience
-        resume_industries = []
+        if not job_industries:
+            return 70  # Neutral score if can't determine job industry
+        
+        # Check resume experience for an overlapping industry, stopping at the first
         for exp in resume_experience:
             company = exp.get('company', '').lower()
             description = exp.get('description', '').lower()
-            resume_industries.extend(self._extract_industry_keywords(f"{company} {description}"))
+            if not job_industries.isdisjoint(self._extract_industry_keywords(f"{company} {description}")):
+                return 100
         
-        # Calculate overlap
-        if not job_industries:
-            return 70  # Neutral score if can't determine job industry
-        
-        matching_industries = set(job_industries) & set(resume_industries)
-        if matching_industries:
-            return 100
-        else:
-            return 50
+        return 50
 
-    def _extract_industry_keywords(self, text: str) -> List[str]:
+    def _extract_industry_keywords(self, text: str) -> FrozenSet[str]:
         """Extract industry keywords from text"""
-        industries = {
-            'fintech': ['finance', 'banking', 'fintech', 'payment', 'trading'],
-            'healthcare': ['healthcare', 'medical', 'hospital', 'pharma'],
-            'ecommerce': ['ecommerce', 'retail', 'shopping', 'marketplace'],
-            'saas': ['saas', 'software', 'platform', 'cloud'],
-            'gaming': ['gaming', 'game', 'entertainment'],
-            'education': ['education', 'learning', 'university', 'school']
-        }
-        
-        found_industries = []
-        for industry, keywords in industries.items():
-            if any(keyword in text for keyword in keywords):
-                found_industries.append(industry)
-        
-        return found_industries
+        # Frozen, since cached results are shared between callers
+        return frozenset(industry for _, industry in self._industry_automaton.iter(text))
 
     def _get_highest_degree(self, education: List[Dict]) -> str:
         """Get highest degree from education list"""
-        degree_hierarchy = ['phd', 'master', 'bachelor', 'associate', 'high_school']
-        
-        for degree_level in degree_hierarchy:
-            for edu in education:
-                degree = edu.get('degree', '').lower()
-                if degree_level in degree or (degree_level == 'phd' and 'doctorate' in degree):
-                    return degree_level
+        # Single pass over the education list, keeping the highest-ranked degree seen
+        matches = [
+            value
+            for edu in education
+            for _, value in self._degree_automaton.iter(edu.get('degree', '').lower())
+        ]
         
-        return 'bachelor'  # Default
+        return min(matches)[1] if matches else 'bachelor'  # Default
 
-    def _extract_required_degree(self, job_description: str, job_requirements: List[str]) -> str:
-        """Extract required degree from job posting"""
-        text = f"{job_description} {' '.join(job_requirements)}".lower()
-        
-        if 'phd' in text or 'doctorate' in text:
-            return 'phd'
-        elif 'master' in text or 'mba' in text:
-            return 'master'
-        elif 'bachelor' in text or 'degree' in text:
-            return 'bachelor'
+    def _extract_required_degree(self, job_description: str, job_requirements: str) -> str:
+        """Extract required degree from the lowercased job description and requirements"""
+        text = f"{job_description} {job_requirements}"
         
-        return 'bachelor'  # Default
+        return _first_ranked(self._required_degree_automaton, text, 'bachelor')  # Default bachelor
 
     def _prepare_resume_text(self, resume_data: Dict[str, Any]) -> str:
         """Prepare resume text for semantic analysis"""
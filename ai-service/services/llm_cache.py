@@ -0,0 +1,86 @@
+import os
+import copy
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Completions sampled above this temperature are too random to reuse by default
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+class MemoryBackend:
+    """In-process LRU store with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._store[key]
+            return None
+
+        self._store.move_to_end(key)
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        # Store and hand out copies, as Redis does, so callers can't mutate the cached entry
+        self._store[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._store.move_to_end(key)
+
+        # Evict least recently used entries
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+
+class RedisBackend:
+    """Redis store so cached completions are shared across workers"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.client.set(key, json.dumps(value), ex=ttl)
+
+class LLMCache:
+    def __init__(self, backend=None, ttl: int = 3600):
+        if backend is None:
+            redis_url = os.getenv("REDIS_URL")
+            backend = RedisBackend(redis_url) if redis_url else MemoryBackend()
+
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(fn: str, data: Any) -> str:
+        """Build an exact-match key from the call name and its canonicalized inputs"""
+        payload = json.dumps({"fn": fn, "data": data}, sort_keys=True, default=str)
+        return "llm:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def should_cache(temperature: float, opt_in: bool = False) -> bool:
+        """Only near-deterministic completions are cached unless the caller opts in"""
+        return opt_in or temperature <= MAX_CACHEABLE_TEMPERATURE
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            print(f"LLM cache read error: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"LLM cache write error: {str(e)}")
@@ -1,38 +1,113 @@
+import io
 import os
 import re
-import requests
-from typing import Dict, List, Any
-import PyPDF2
+import bisect
+import asyncio
+import hashlib
+import threading
+import multiprocessing
+import httpx
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Set, Tuple
+import fitz  # PyMuPDF
 from docx import Document
 from PIL import Image
 import pytesseract
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-import spacy
+import ahocorasick
 
-# Download required NLTK data
+# Optional in-process OCR engine; pytesseract shells out to the tesseract CLI per image
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+    import tesserocr
+except ImportError:
+    tesserocr = None
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+from services.llm_cache import LLMCache
+
+# Extraction patterns, compiled once at import
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_LOCATION_RES = (
+    re.compile(r'([A-Za-z\s]+,\s*[A-Z]{2})'),  # City, State
+    re.compile(r'([A-Za-z\s]+,\s*[A-Za-z\s]+,\s*[A-Z]{2,3})'),  # City, State, Country
+)
+# A job entry starts at a capitalized line whose first lowercase letter begins a title keyword
+_JOB_TITLE_RE = re.compile(r'[^a-z]*(?:Engineer|Developer|Manager|Analyst|Specialist|Coordinator|Director|Lead|Senior|Junior)')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DATE_RE = re.compile(r'(\d{1,2}/\d{4}|\d{4}|[A-Za-z]+\s+\d{4})')
+_YEAR_RE = re.compile(r'(\d{4})')
+_DEGREE_RES = (
+    re.compile(r'(Bachelor|Master|PhD|Doctorate|Associate).*?(?:in|of)\s+([^,\n]+)', re.IGNORECASE),
+    re.compile(r'(B\.?S\.?|M\.?S\.?|Ph\.?D\.?|B\.?A\.?|M\.?A\.?).*?(?:in|of)?\s+([^,\n]+)', re.IGNORECASE),
+)
+_GPA_RE = re.compile(r'GPA:?\s*(\d+\.?\d*)', re.IGNORECASE)
+_URL_RE = re.compile(r'https?://[^\s]+')
+
+# Keyword checks run on lowercased lines; plain alternations keep substring semantics
+_NAME_HEADER_RE = re.compile(r'resume|cv|curriculum')
+_SUMMARY_RE = re.compile(r'summary|objective|profile|about')
+_SUMMARY_END_RE = re.compile(r'experience|education|skills')
+_INSTITUTION_RE = re.compile(r'university|college|institute')
+
+# Heading keywords for each extracted section; a section runs until the next major heading
+SECTION_KEYWORDS = {
+    'experience': ['experience', 'work experience', 'employment'],
+    'education': ['education', 'academic background'],
+    'certifications': ['certifications', 'certificates', 'licenses'],
+    'projects': ['projects', 'personal projects', 'side projects']
+}
+MAJOR_SECTIONS = ['experience', 'education', 'skills', 'projects', 'certifications']
+
+def _build_section_automaton(section_keywords: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """Keyword automaton over all headings; values carry the keyword and the sections it opens"""
+    openers = {keyword: set() for keyword in MAJOR_SECTIONS}
+    for section, keywords in section_keywords.items():
+        for keyword in keywords:
+            openers.setdefault(keyword, set()).add(section)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, sections in openers.items():
+        automaton.add_word(keyword, (keyword in MAJOR_SECTIONS, frozenset(sections)))
+    automaton.make_automaton()
+    return automaton
+
+_SECTION_AUTOMATON = _build_section_automaton(SECTION_KEYWORDS)
+
+# Common certification issuers; the first listed issuer found on a line wins
+CERT_ISSUERS = ['AWS', 'Microsoft', 'Google', 'Oracle', 'Cisco', 'CompTIA', 'PMI']
+
+def _build_issuer_automaton(issuers: List[str]) -> ahocorasick.Automaton:
+    """Keyword automaton over issuer names; values carry the issuer's priority"""
+    automaton = ahocorasick.Automaton()
+    for rank, issuer in enumerate(issuers):
+        automaton.add_word(issuer.lower(), (rank, issuer))
+    automaton.make_automaton()
+    return automaton
+
+_ISSUER_AUTOMATON = _build_issuer_automaton(CERT_ISSUERS)
+
+@lru_cache(maxsize=1)
+def _get_tess_api():
+    """Initialize the Tesseract engine once per process, or None to fall back to pytesseract"""
+    if tesserocr is None:
+        return None
+    try:
+        return tesserocr.PyTessBaseAPI()
+    except RuntimeError as e:
+        print(f"Warning: tesserocr unavailable, falling back to pytesseract: {str(e)}")
+        return None
+
+# The engine keeps per-image state, so calls on it are serialized
+_TESS_LOCK = threading.Lock()
+
+# Worker processes for batch parsing; PDF/OCR/regex work is CPU-bound
+PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", min(os.cpu_count() or 1, 4)))
+
+# Bump to invalidate cached parse results after extraction changes
+PARSE_CACHE_VERSION = "v1"
 
 class ResumeParser:
-    def __init__(self):
-        # Load spaCy model for NER
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Warning: spaCy English model not found. Install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
-        
-        self.stop_words = set(stopwords.words('english'))
-        
+    def __init__(self, network: bool = True):
         # Common skill keywords
         self.tech_skills = {
             'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin'],
@@ -43,24 +118,84 @@ class ResumeParser:
             'mobile': ['android', 'ios', 'react native', 'flutter', 'xamarin'],
             'tools': ['git', 'jira', 'confluence', 'slack', 'figma', 'photoshop']
         }
+        
+        self.common_languages = [
+            'english', 'spanish', 'french', 'german', 'italian', 'portuguese',
+            'chinese', 'japanese', 'korean', 'arabic', 'hindi', 'russian'
+        ]
+        
+        # Keyword automaton: a single pass over the text finds every known skill and language.
+        # Languages carry their list position so they come back in the same order.
+        self._keyword_automaton = ahocorasick.Automaton()
+        for skill_list in self.tech_skills.values():
+            for skill in skill_list:
+                self._keyword_automaton.add_word(skill, ('skill', skill.title()))
+        for rank, language in enumerate(self.common_languages):
+            self._keyword_automaton.add_word(language, ('language', (rank, language.title())))
+        self._keyword_automaton.make_automaton()
+        self._section_automaton = _SECTION_AUTOMATON
+        self._issuer_automaton = _ISSUER_AUTOMATON
+        
+        # Created on the first batch so single-resume use never starts workers
+        self._pool = None
+        
+        # Batch workers only extract, so they skip the download client and the cache
+        self._http = None
+        self.cache = None
+        if network:
+            # Pooled HTTP client for resume downloads
+            self._http = httpx.AsyncClient(follow_redirects=True, timeout=30.0)
+            
+            # Parse results keyed by file content, so re-scoring a resume skips extraction
+            self.cache = LLMCache(ttl=int(os.getenv("RESUME_CACHE_TTL", 24 * 3600)))
+
+    async def aclose(self):
+        """Close pooled connections and batch worker processes on shutdown"""
+        if self._http is not None:
+            await self._http.aclose()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
     async def parse_resume(self, file_url: str, file_name: str) -> Dict[str, Any]:
         """Parse resume from URL"""
+        return await self._parse_url(file_url, file_name)
+
+    async def parse_batch(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Parse (file_url, file_name) pairs across worker processes, preserving order.
+        A resume that fails yields {"error": ...} in its slot instead of failing the batch."""
+        if self._pool is None:
+            # Forking the running server would copy its event loop and open sockets into
+            # every worker, so workers come from a clean forkserver (spawn where unsupported).
+            # The forkserver preloads the main module once, so workers don't each re-import
+            # it, and this module. Workers build their parser at startup rather than on
+            # their first resume.
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["__main__", __name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=context, initializer=_worker_parser)
+        
+        # Downloads overlap on the event loop; only parsing goes to the workers
+        results = await asyncio.gather(*(
+            self._parse_url(file_url, file_name, self._pool)
+            for file_url, file_name in items
+        ), return_exceptions=True)
+        
+        return [
+            {"error": str(result)} if isinstance(result, Exception) else result
+            for result in results
+        ]
+
+    async def _parse_url(self, file_url: str, file_name: str, pool: Optional[ProcessPoolExecutor] = None) -> Dict[str, Any]:
+        """Download a resume and parse it in memory, in a worker process when a pool is given"""
         try:
-            # Download file
-            response = requests.get(file_url)
-            temp_path = f"/tmp/{file_name}"
-            
-            with open(temp_path, 'wb') as f:
-                f.write(response.content)
+            response = await self._http.get(file_url)
+            response.raise_for_status()
+            file_extension = os.path.splitext(file_name)[1].lower()
             
-            # Parse file
-            parsed_data = await self.parse_file(temp_path)
-            
-            # Clean up
-            os.remove(temp_path)
-            
-            return parsed_data
+            return await self._parse_cached(response.content, file_extension, pool)
         
         except Exception as e:
             raise Exception(f"Failed to parse resume: {str(e)}")
@@ -68,13 +203,36 @@ class ResumeParser:
     async def parse_file(self, file_path: str) -> Dict[str, Any]:
         """Parse resume file"""
         file_extension = os.path.splitext(file_path)[1].lower()
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        return await self._parse_cached(data, file_extension)
+
+    async def _parse_cached(self, data: bytes, file_extension: str, pool: Optional[ProcessPoolExecutor] = None) -> Dict[str, Any]:
+        """Parse file contents unless the same file was parsed recently"""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        cache_key = f"resume:{PARSE_CACHE_VERSION}:{file_extension}:{digest}"
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if pool is None:
+            parsed_data = self._parse_bytes_sync(data, file_extension)
+        else:
+            loop = asyncio.get_running_loop()
+            parsed_data = await loop.run_in_executor(pool, _parse_one, data, file_extension)
         
+        await self.cache.set(cache_key, parsed_data)
+        return parsed_data
+
+    def _parse_bytes_sync(self, data: bytes, file_extension: str) -> Dict[str, Any]:
+        """Extract text from resume file contents and parse it"""
         if file_extension == '.pdf':
-            text = self._extract_text_from_pdf(file_path)
+            text = self._extract_text_from_pdf(data)
         elif file_extension in ['.doc', '.docx']:
-            text = self._extract_text_from_docx(file_path)
+            text = self._extract_text_from_docx(data)
         elif file_extension in ['.jpg', '.jpeg', '.png']:
-            text = self._extract_text_from_image(file_path)
+            text = self._extract_text_from_image(data)
         else:
             raise Exception(f"Unsupported file format: {file_extension}")
         
@@ -83,36 +241,38 @@ class ResumeParser:
         
         return parsed_data
 
-    def _extract_text_from_pdf(self, file_path: str) -> str:
+    def _extract_text_from_pdf(self, data: bytes) -> str:
         """Extract text from PDF"""
-        text = ""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            # MuPDF decodes the content streams in C, far faster than a pure-Python reader
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                text = "".join(page.get_text("text") + "\n" for page in doc)
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
         
         return text
 
-    def _extract_text_from_docx(self, file_path: str) -> str:
+    def _extract_text_from_docx(self, data: bytes) -> str:
         """Extract text from DOCX"""
         try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            doc = Document(io.BytesIO(data))
+            text = "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
         except Exception as e:
             raise Exception(f"Failed to extract text from DOCX: {str(e)}")
         
         return text
 
-    def _extract_text_from_image(self, file_path: str) -> str:
+    def _extract_text_from_image(self, data: bytes) -> str:
         """Extract text from image using OCR"""
         try:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
+            image = Image.open(io.BytesIO(data))
+            api = _get_tess_api()
+            if api is None:
+                text = pytesseract.image_to_string(image)
+            else:
+                with _TESS_LOCK:
+                    api.SetImage(image)
+                    text = api.GetUTF8Text()
         except Exception as e:
             raise Exception(f"Failed to extract text from image: {str(e)}")
         
@@ -120,70 +280,66 @@ class ResumeParser:
 
     def _parse_text_content(self, text: str) -> Dict[str, Any]:
         """Parse structured data from text"""
+        # Split and lowercase once; every extractor reuses these lines
+        lines = text.split('\n')
+        text_lower = text.lower()
+        lower_lines = text_lower.split('\n')
+        sections = self._build_section_index(lines, lower_lines)
+        keyword_hits = {value for _, value in self._keyword_automaton.iter(text_lower)}
+        
         parsed_data = {
-            'personal_info': self._extract_personal_info(text),
-            'summary': self._extract_summary(text),
-            'skills': self._extract_skills(text),
-            'experience': self._extract_experience(text),
-            'education': self._extract_education(text),
-            'certifications': self._extract_certifications(text),
-            'languages': self._extract_languages(text),
-            'projects': self._extract_projects(text)
+            'personal_info': self._extract_personal_info(text, lines, lower_lines),
+            'summary': self._extract_summary(lines, lower_lines),
+            'skills': self._extract_skills(keyword_hits),
+            'experience': self._extract_experience(sections),
+            'education': self._extract_education(sections),
+            'certifications': self._extract_certifications(sections),
+            'languages': self._extract_languages(keyword_hits),
+            'projects': self._extract_projects(sections)
         }
         
         return parsed_data
 
-    def _extract_personal_info(self, text: str) -> Dict[str, str]:
+    def _extract_personal_info(self, text: str, lines: List[str], lower_lines: List[str]) -> Dict[str, str]:
         """Extract personal information"""
         personal_info = {}
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            personal_info['email'] = emails[0]
+        # Extract email (only the first hit is kept, so stop scanning there)
+        email_match = _EMAIL_RE.search(text)
+        if email_match:
+            personal_info['email'] = email_match.group()
         
         # Extract phone
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            personal_info['phone'] = ''.join(phones[0]) if isinstance(phones[0], tuple) else phones[0]
+        phone_match = _PHONE_RE.search(text)
+        if phone_match:
+            personal_info['phone'] = phone_match.group(1) or ''
         
         # Extract name (first few words, excluding common resume headers)
-        lines = text.split('\n')
-        for line in lines[:5]:
+        for line, line_lower in zip(lines[:5], lower_lines[:5]):
             line = line.strip()
-            if line and not any(header in line.lower() for header in ['resume', 'cv', 'curriculum']):
+            if line and not _NAME_HEADER_RE.search(line_lower):
                 words = line.split()
                 if 2 <= len(words) <= 4 and all(word.isalpha() for word in words):
                     personal_info['name'] = line
                     break
         
         # Extract location (basic pattern matching)
-        location_patterns = [
-            r'([A-Za-z\s]+,\s*[A-Z]{2})',  # City, State
-            r'([A-Za-z\s]+,\s*[A-Za-z\s]+,\s*[A-Z]{2,3})',  # City, State, Country
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                personal_info['location'] = matches[0]
+        for pattern in _LOCATION_RES:
+            location_match = pattern.search(text)
+            if location_match:
+                personal_info['location'] = location_match.group(1)
                 break
         
         return personal_info
 
-    def _extract_summary(self, text: str) -> str:
+    def _extract_summary(self, lines: List[str], lower_lines: List[str]) -> str:
         """Extract professional summary"""
-        summary_keywords = ['summary', 'objective', 'profile', 'about']
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in summary_keywords):
+        for i, line_lower in enumerate(lower_lines):
+            if _SUMMARY_RE.search(line_lower):
                 # Get next few lines as summary
                 summary_lines = []
                 for j in range(i + 1, min(i + 5, len(lines))):
-                    if lines[j].strip() and not any(header in lines[j].lower() for header in ['experience', 'education', 'skills']):
+                    if lines[j].strip() and not _SUMMARY_END_RE.search(lower_lines[j]):
                         summary_lines.append(lines[j].strip())
                     else:
                         break
@@ -193,40 +349,21 @@ class ResumeParser:
         
         return ""
 
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text"""
-        skills = set()
-        text_lower = text.lower()
-        
-        # Extract from all skill categories
-        for category, skill_list in self.tech_skills.items():
-            for skill in skill_list:
-                if skill in text_lower:
-                    skills.add(skill.title())
-        
-        # Look for skills section
-        skills_section = self._find_section(text, ['skills', 'technical skills', 'technologies'])
-        if skills_section:
-            # Extract skills from skills section
-            words = word_tokenize(skills_section.lower())
-            for word in words:
-                if word not in self.stop_words and len(word) > 2:
-                    for category, skill_list in self.tech_skills.items():
-                        if word in skill_list:
-                            skills.add(word.title())
-        
-        return list(skills)
-
-    def _extract_experience(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_skills(self, keyword_hits: Set[Tuple[str, Any]]) -> List[str]:
+        """Extract skills from the keyword scan of the text"""
+        # Skills-section words are substrings of the full text, so one scan covers them too
+        return [skill for kind, skill in keyword_hits if kind == 'skill']
+
+    def _extract_experience(self, sections: Dict[str, Tuple[List[str], List[str]]]) -> List[Dict[str, Any]]:
         """Extract work experience"""
         experience = []
-        experience_section = self._find_section(text, ['experience', 'work experience', 'employment'])
+        experience_section, _ = sections.get('experience', ([], []))
         
         if not experience_section:
             return experience
         
         # Split by common patterns that indicate new job entries
-        job_entries = re.split(r'\n(?=[A-Z][^a-z]*(?:Engineer|Developer|Manager|Analyst|Specialist|Coordinator|Director|Lead|Senior|Junior))', experience_section)
+        job_entries = self._split_job_entries(experience_section)
         
         for entry in job_entries:
             if len(entry.strip()) < 20:  # Skip very short entries
@@ -238,6 +375,37 @@ class ResumeParser:
         
         return experience
 
+    def _split_job_entries(self, lines: List[str]) -> List[str]:
+        """Group section lines into job entries in one linear pass"""
+        # Title lines with no lowercase letters continue onto the next line that has one,
+        # so note that line for every index
+        next_lower = [None] * len(lines)
+        following = None
+        for i in range(len(lines) - 1, -1, -1):
+            if _LOWERCASE_RE.search(lines[i]):
+                following = i
+            next_lower[i] = following
+        
+        entries = []
+        start = 0
+        for i in range(1, len(lines)):
+            line = lines[i]
+            j = next_lower[i]
+            if not 'A' <= line[:1] <= 'Z' or j is None:
+                continue
+            
+            if j == i:
+                is_title = _JOB_TITLE_RE.match(line, 1)
+            else:
+                is_title = _JOB_TITLE_RE.match(lines[j])
+            
+            if is_title:
+                entries.append('\n'.join(lines[start:i]))
+                start = i
+        
+        entries.append('\n'.join(lines[start:]))
+        return entries
+
     def _parse_job_entry(self, entry: str) -> Dict[str, Any]:
         """Parse individual job entry"""
         lines = [line.strip() for line in entry.split('\n') if line.strip()]
@@ -271,14 +439,14 @@ class ResumeParser:
             job_info['position'] = first_line
         
         # Look for dates
-        date_pattern = r'(\d{1,2}/\d{4}|\d{4}|[A-Za-z]+\s+\d{4})'
-        dates = re.findall(date_pattern, entry)
+        dates = _DATE_RE.findall(entry)
+        entry_lower = entry.lower()
         
         if dates:
             job_info['start_date'] = dates[0]
             if len(dates) > 1 and 'present' not in dates[1].lower():
                 job_info['end_date'] = dates[1]
-            elif 'present' in entry.lower() or 'current' in entry.lower():
+            elif 'present' in entry_lower or 'current' in entry_lower:
                 job_info['current'] = True
                 job_info['end_date'] = 'Present'
         
@@ -289,11 +457,11 @@ class ResumeParser:
         # Calculate duration (simplified)
         if job_info['start_date']:
             try:
-                start_year = int(re.search(r'\d{4}', job_info['start_date']).group())
+                start_year = int(_YEAR_RE.search(job_info['start_date']).group())
                 if job_info['current']:
                     end_year = 2024  # Current year
                 elif job_info['end_date']:
-                    end_year = int(re.search(r'\d{4}', job_info['end_date']).group())
+                    end_year = int(_YEAR_RE.search(job_info['end_date']).group())
                 else:
                     end_year = start_year
                 
@@ -303,42 +471,35 @@ class ResumeParser:
         
         return job_info
 
-    def _extract_education(self, text: str) -> List[Dict[str, str]]:
+    def _extract_education(self, sections: Dict[str, Tuple[List[str], List[str]]]) -> List[Dict[str, str]]:
         """Extract education information"""
         education = []
-        education_section = self._find_section(text, ['education', 'academic background'])
+        education_section, education_lower = sections.get('education', ([], []))
         
         if not education_section:
             return education
         
-        # Look for degree patterns
-        degree_patterns = [
-            r'(Bachelor|Master|PhD|Doctorate|Associate).*?(?:in|of)\s+([^,\n]+)',
-            r'(B\.?S\.?|M\.?S\.?|Ph\.?D\.?|B\.?A\.?|M\.?A\.?).*?(?:in|of)?\s+([^,\n]+)',
-        ]
-        
-        lines = education_section.split('\n')
         current_entry = {}
         
-        for line in lines:
+        for line, line_lower in zip(education_section, education_lower):
             line = line.strip()
             if not line:
                 continue
             
             # Check for degree patterns
-            for pattern in degree_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
+            for pattern in _DEGREE_RES:
+                match = pattern.search(line)
                 if match:
                     current_entry['degree'] = match.group(1)
                     current_entry['field'] = match.group(2).strip()
                     break
             
             # Look for institution names (usually capitalized)
-            if 'university' in line.lower() or 'college' in line.lower() or 'institute' in line.lower():
+            if _INSTITUTION_RE.search(line_lower):
                 current_entry['institution'] = line
             
             # Look for dates
-            date_match = re.search(r'(\d{4})', line)
+            date_match = _YEAR_RE.search(line)
             if date_match:
                 if 'start_date' not in current_entry:
                     current_entry['start_date'] = date_match.group(1)
@@ -346,7 +507,7 @@ class ResumeParser:
                     current_entry['end_date'] = date_match.group(1)
             
             # Look for GPA
-            gpa_match = re.search(r'GPA:?\s*(\d+\.?\d*)', line, re.IGNORECASE)
+            gpa_match = _GPA_RE.search(line)
             if gpa_match:
                 current_entry['gpa'] = gpa_match.group(1)
         
@@ -355,16 +516,15 @@ class ResumeParser:
         
         return education
 
-    def _extract_certifications(self, text: str) -> List[Dict[str, str]]:
+    def _extract_certifications(self, sections: Dict[str, Tuple[List[str], List[str]]]) -> List[Dict[str, str]]:
         """Extract certifications"""
         certifications = []
-        cert_section = self._find_section(text, ['certifications', 'certificates', 'licenses'])
+        cert_section, cert_lower = sections.get('certifications', ([], []))
         
         if not cert_section:
             return certifications
         
-        lines = cert_section.split('\n')
-        for line in lines:
+        for line, line_lower in zip(cert_section, cert_lower):
             line = line.strip()
             if len(line) > 10:  # Skip very short lines
                 cert_info = {
@@ -375,14 +535,12 @@ class ResumeParser:
                 }
                 
                 # Look for common certification issuers
-                issuers = ['AWS', 'Microsoft', 'Google', 'Oracle', 'Cisco', 'CompTIA', 'PMI']
-                for issuer in issuers:
-                    if issuer.lower() in line.lower():
-                        cert_info['issuer'] = issuer
-                        break
+                issuers = [value for _, value in self._issuer_automaton.iter(line_lower)]
+                if issuers:
+                    cert_info['issuer'] = min(issuers)[1]
                 
                 # Look for dates
-                date_match = re.search(r'(\d{4})', line)
+                date_match = _YEAR_RE.search(line)
                 if date_match:
                     cert_info['date'] = date_match.group(1)
                 
@@ -390,40 +548,28 @@ class ResumeParser:
         
         return certifications
 
-    def _extract_languages(self, text: str) -> List[str]:
-        """Extract languages"""
-        languages = []
-        common_languages = [
-            'english', 'spanish', 'french', 'german', 'italian', 'portuguese',
-            'chinese', 'japanese', 'korean', 'arabic', 'hindi', 'russian'
-        ]
-        
-        text_lower = text.lower()
-        for language in common_languages:
-            if language in text_lower:
-                languages.append(language.title())
-        
-        return languages
+    def _extract_languages(self, keyword_hits: Set[Tuple[str, Any]]) -> List[str]:
+        """Extract languages from the keyword scan of the text"""
+        return [language for _, language in sorted(value for kind, value in keyword_hits if kind == 'language')]
 
-    def _extract_projects(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_projects(self, sections: Dict[str, Tuple[List[str], List[str]]]) -> List[Dict[str, Any]]:
         """Extract projects"""
         projects = []
-        projects_section = self._find_section(text, ['projects', 'personal projects', 'side projects'])
+        projects_section, _ = sections.get('projects', ([], []))
         
         if not projects_section:
             return projects
         
         # Simple project extraction
-        lines = projects_section.split('\n')
         current_project = {}
         
-        for line in lines:
+        for line in projects_section:
             line = line.strip()
             if not line:
                 continue
             
             # Look for URLs
-            url_match = re.search(r'https?://[^\s]+', line)
+            url_match = _URL_RE.search(line)
             if url_match:
                 current_project['url'] = url_match.group()
                 line = line.replace(url_match.group(), '').strip()
@@ -443,27 +589,39 @@ class ResumeParser:
         
         return projects
 
-    def _find_section(self, text: str, keywords: List[str]) -> str:
-        """Find a section in the text based on keywords"""
-        lines = text.split('\n')
-        section_start = -1
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in keywords):
-                section_start = i
-                break
-        
-        if section_start == -1:
-            return ""
-        
-        # Find section end (next major section or end of text)
-        section_end = len(lines)
-        major_sections = ['experience', 'education', 'skills', 'projects', 'certifications']
-        
-        for i in range(section_start + 1, len(lines)):
-            line = lines[i].lower().strip()
-            if any(section in line for section in major_sections) and line != lines[section_start].lower().strip():
-                section_end = i
-                break
+    def _build_section_index(self, lines: List[str], lower_lines: List[str]) -> Dict[str, Tuple[List[str], List[str]]]:
+        """Locate every section in one pass; each maps to its lines and their lowercased copies"""
+        starts = {}
+        major_lines = []
+        
+        for i, line_lower in enumerate(lower_lines):
+            is_major = False
+            for _, (major, opened) in self._section_automaton.iter(line_lower):
+                is_major = is_major or major
+                for section in opened:
+                    starts.setdefault(section, i)
+            if is_major:
+                major_lines.append(i)
+        
+        sections = {}
+        for section, section_start in starts.items():
+            # Section ends at the next major heading that differs from its own
+            section_end = len(lines)
+            heading = lower_lines[section_start].strip()
+            for i in major_lines[bisect.bisect_right(major_lines, section_start):]:
+                if lower_lines[i].strip() != heading:
+                    section_end = i
+                    break
+            
+            sections[section] = (lines[section_start + 1:section_end], lower_lines[section_start + 1:section_end])
         
-        return '\n'.join(lines[section_start + 1:section_end])
\ No newline at end of file
+        return sections
+
+@lru_cache(maxsize=1)
+def _worker_parser() -> ResumeParser:
+    """One extraction-only parser per worker process, built when the worker starts"""
+    return ResumeParser(network=False)
+
+def _parse_one(data: bytes, file_extension: str) -> Dict[str, Any]:
+    """Process-pool entry point; module level so it pickles, and touches no network or cache"""
+    return _worker_parser()._parse_bytes_sync(data, file_extension)
@@ -0,0 +1,39 @@
+import asyncio
+
+from services.job_matcher import JobMatcher
+
+RESUME = {
+    'skills': ['Python', 'Docker', 'AWS'],
+    'experience': [{'position': 'Senior Engineer', 'description': 'Built python services on aws', 'duration': 5}],
+    'education': [{'degree': 'Bachelor', 'field': 'Computer Science'}],
+    'summary': 'Backend engineer focused on cloud services'
+}
+
+JOB = {
+    'title': 'Senior Python Engineer',
+    'description': 'Build cloud services in python on aws',
+    'requirements': ['python', 'aws', 'docker'],
+    'company': 'Acme'
+}
+
+
+def _matcher_with_corpus() -> JobMatcher:
+    matcher = JobMatcher()
+    corpus = [
+        'python engineer building cloud services on aws',
+        'senior python engineer with docker and aws experience',
+        'frontend developer using react and javascript',
+        'data analyst working with sql and python'
+    ] * 3
+    matcher.fit_corpus(corpus)
+    return matcher
+
+
+def test_batch_without_resumes_returns_empty():
+    matcher = _matcher_with_corpus()
+    assert asyncio.run(matcher.calculate_matches_batch([], [JOB])) == []
+
+
+def test_batch_without_jobs_returns_empty_rows():
+    matcher = _matcher_with_corpus()
+    assert asyncio.run(matcher.calculate_matches_batch([RESUME, RESUME], [])) == [[], []]